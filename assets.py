@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+
+
+# Helper to make assets work in both normal run and PyInstaller exe
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+class AssetRegistry:
+    """Loads every texture once and hands out shared, pre-scaled copies.
+
+    Textures are keyed by asset path, and the scale that fits a texture
+    into a target size is cached per (path, target size). Sprites built
+    from the registry share the same Texture objects, so spawning a sprite
+    never touches the filesystem or recomputes a hit box after the first
+    load. Failed loads are remembered as well, so a missing file is only
+    looked up once. Sounds are cached the same way.
+
+    Loading is safe from worker threads, which is how `Preloader` fills the
+    registry in the background.
+    """
+    def __init__(self):
+        self._textures = {}
+        self._sounds = {}
+        self._failures = {}
+        self._scaled = {}
+        self._fallbacks = {}
+        self._lock = threading.Lock()
+
+    def _load(self, cache, path, loader):
+        with self._lock:
+            asset = cache.get(path)
+            if asset is not None:
+                return asset
+            if path in self._failures:
+                raise self._failures[path]
+        # Decode outside the lock so worker threads load in parallel
+        try:
+            asset = loader(resource_path(path))
+        except Exception as e:
+            with self._lock:
+                self._failures[path] = e
+            raise
+        with self._lock:
+            return cache.setdefault(path, asset)
+
+    def texture(self, path):
+        """Shared texture for an asset path; raises if it can't be loaded"""
+        return self._load(self._textures, path, arcade.load_texture)
+
+    def sound(self, path):
+        """Shared, fully decoded sound for an asset path"""
+        return self._load(self._sounds, path, arcade.load_sound)
+
+    def fallback_texture(self, size, color):
+        """Shared soft-circle texture used when an image is missing"""
+        key = (size, tuple(color))
+        texture = self._fallbacks.get(key)
+        if texture is None:
+            texture = arcade.make_soft_circle_texture(size, color)
+            self._fallbacks[key] = texture
+        return texture
+
+    def scaled(self, path, target_size, fallback_color=None, fallback_size=None):
+        """(texture, scale) that fits the asset into target_size
+
+        Falls back to a soft circle of fallback_size when the image can't be
+        loaded; without a fallback the load error is raised.
+        """
+        key = (path, tuple(target_size), fallback_color and tuple(fallback_color))
+        cached = self._scaled.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            texture = self.texture(path)
+            scale = 1.0
+            # Auto-scale to target size
+            if texture.width > 0 and texture.height > 0:
+                scale = min(target_size[0] / texture.width, target_size[1] / texture.height)
+        except Exception:
+            if not (fallback_color and fallback_size):
+                raise
+            texture = self.fallback_texture(max(fallback_size), fallback_color)
+            scale = fallback_size[0] / texture.width
+
+        self._scaled[key] = (texture, scale)
+        return texture, scale
+
+    def preload(self, paths):
+        """Load a batch of textures up front, skipping ones that fail"""
+        for path in paths:
+            try:
+                self.texture(path)
+            except Exception as e:
+                print(f"Could not load {path}: {e}")
+
+
+class Preloader:
+    """Loads textures and sounds into a registry on a thread pool.
+
+    The caller keeps running its frame loop and polls `progress` and
+    `done`; nothing blocks until `finish`, which waits for stragglers and
+    records how long the whole load took in `elapsed`.
+    """
+    def __init__(self, registry, textures=(), sounds=(), workers=4):
+        self.registry = registry
+        self.start_time = time.perf_counter()
+        self.elapsed = None
+        self.failed = []
+        self.total = len(textures) + len(sounds)
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="asset-loader")
+        for path in textures:
+            self._executor.submit(self._load, registry.texture, path)
+        for path in sounds:
+            self._executor.submit(self._load, registry.sound, path)
+
+    def _load(self, loader, path):
+        try:
+            loader(path)
+        except Exception as e:
+            print(f"Could not load {path}: {e}")
+            with self._lock:
+                self.failed.append(path)
+        finally:
+            with self._lock:
+                self.completed += 1
+
+    @property
+    def progress(self):
+        """Fraction of assets finished, failed ones included"""
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return self.completed >= self.total
+
+    def finish(self):
+        """Wait for any remaining loads and return the total load time"""
+        self._executor.shutdown(wait=True)
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.start_time
+        return self.elapsed
+
+
+registry = AssetRegistry()
@@ -0,0 +1,74 @@
+import math
+import time
+from collections import deque
+
+# (voices, cooldown seconds) for sounds without their own limit
+DEFAULT_LIMIT = (4, 0.03)
+
+
+class AudioMixer:
+    """Plays sound effects with per-sound voice caps.
+
+    `play` only decides whether a cue is heard and queues it, so simulation
+    ticks never call into the audio driver; `flush`, called once per frame
+    from the window's update, starts everything queued since the last one.
+    Both run on the main thread, which pyglet's players require.
+
+    A cue is dropped when the same sound started less than its cooldown ago
+    (a nuke's dozens of explosions in one tick become one), when that sound
+    already has its maximum number of voices playing, or when `max_voices`
+    sounds are playing in total. Voices are counted by the sound's length
+    rather than by asking the players.
+
+    Sounds should be fully decoded (`arcade.load_sound` without
+    streaming) so starting one is just handing a buffer to the driver.
+    """
+    def __init__(self, sounds, limits=None, max_voices=16):
+        self.sounds = dict(sounds)
+        self.limits = limits or {}
+        self.max_voices = max_voices
+        self.lengths = {name: sound.get_length() or 1.0 for name, sound in self.sounds.items()}
+        # End times of the voices started for each sound, oldest first
+        self._voices = {name: deque() for name in self.sounds}
+        self._last_start = {}
+        self.played = 0
+        self.dropped = 0
+        self._pending = []
+
+    def active_voices(self, now=None):
+        """Number of voices still playing, dropping the ones that finished"""
+        now = time.perf_counter() if now is None else now
+        total = 0
+        for ends in self._voices.values():
+            while ends and ends[0] <= now:
+                ends.popleft()
+            total += len(ends)
+        return total
+
+    def play(self, name, volume=0.5):
+        """Queue a sound effect; returns False if it was dropped"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return False
+        now = time.perf_counter()
+        voices, cooldown = self.limits.get(name, DEFAULT_LIMIT)
+        if (now - self._last_start.get(name, -math.inf) < cooldown
+                or self.active_voices(now) >= self.max_voices
+                or len(self._voices[name]) >= voices):
+            self.dropped += 1
+            return False
+        self._voices[name].append(now + self.lengths[name])
+        self._last_start[name] = now
+        self._pending.append((sound, volume))
+        self.played += 1
+        return True
+
+    def flush(self):
+        """Start every queued sound; call from the main thread"""
+        pending = self._pending
+        self._pending = []
+        for sound, volume in pending:
+            try:
+                sound.play(volume=volume)
+            except Exception as e:
+                print(f"Could not play sound: {e}")
@@ -0,0 +1,178 @@
+"""Full-screen backdrop and parallax layer drawn from GPU-resident textures."""
+import numpy as np
+import arcade
+from arcade.gl import geometry
+from PIL import Image
+
+from assets import registry
+
+VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform vec2 offset;
+uniform vec2 uv_scale;
+uniform vec2 scroll;
+
+in vec2 in_vert;
+in vec2 in_uv;
+
+out vec2 v_uv;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_vert + offset, 0.0, 1.0);
+    v_uv = in_uv * uv_scale + scroll;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D layer;
+
+in vec2 v_uv;
+
+out vec4 f_color;
+
+void main() {
+    f_color = texture(layer, v_uv);
+}
+"""
+
+# Backdrops are opaque, so they can be stored as DXT1 where S3TC is available
+S3TC_EXTENSION = "GL_EXT_texture_compression_s3tc"
+GL_COMPRESSED_RGB_S3TC_DXT1_EXT = 0x83F0
+
+
+def starfield_image(size=256, stars=140, seed=0):
+    """Square RGBA tile of scattered stars on transparent black
+
+    Stars are single pixels, so the tile repeats without seams.
+    """
+    rng = np.random.default_rng(seed)
+    pixels = np.zeros((size, size, 4), dtype=np.uint8)
+    x = rng.integers(0, size, stars)
+    y = rng.integers(0, size, stars)
+    pixels[y, x, :3] = 255
+    pixels[y, x, 3] = rng.integers(80, 256, stars)
+    return Image.fromarray(pixels, "RGBA")
+
+
+class Background:
+    """Backdrop image plus an optional scrolling parallax layer.
+
+    Backdrop images come decoded from the asset registry and are resized
+    to the pixels they cover and uploaded with mipmaps the first time they
+    are shown; switching back to one later (on restart) reuses its GPU
+    texture, keyed by path and size so a change of resolution uploads a
+    fresh copy. Both layers draw the same pre-built quad, which overhangs
+    the screen by `margin` on every side so a shake offset never uncovers
+    the edges. `scale` is the number of pixels per unit the quad is drawn
+    at, which sets the uploaded size. The parallax layer tiles its image
+    with GL_REPEAT, so scrolling it only changes a uniform.
+
+    GL objects are created on first draw, like the bullet batches.
+    """
+    def __init__(self, width, height, margin=0, scale=1.0, compress=True):
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.scale = scale
+        self.compress = compress
+        self.path = None
+        self.parallax_image = None
+        self.parallax_speed = 0.0
+        self.scroll = 0.0
+        self._textures = {}
+        self._parallax = None
+        self._program = None
+        self._quad = None
+
+    def select(self, path):
+        """Show the backdrop image at `path`; returns False if it can't be loaded"""
+        try:
+            registry.texture(path)
+        except Exception as e:
+            print(f"Failed to load background: {e}")
+            self.path = None
+            return False
+        self.path = path
+        return True
+
+    def set_parallax(self, image, speed):
+        """Tile the RGBA `image` over the backdrop, scrolling down at `speed` px/s
+
+        None removes the layer.
+        """
+        self.parallax_image = image
+        self.parallax_speed = speed
+        self.scroll = 0.0
+        self._parallax = None
+
+    def update(self, delta_time):
+        if self.parallax_image is not None:
+            step = self.parallax_speed * delta_time / self.parallax_image.height
+            self.scroll = (self.scroll + step) % 1.0
+
+    @property
+    def quad_size(self):
+        return self.width + 2 * self.margin, self.height + 2 * self.margin
+
+    def _upload(self, ctx, image, size, wrap, compress=False):
+        image = image.convert("RGBA")
+        if image.size != size:
+            image = image.resize(size, Image.LANCZOS)
+        # PIL rows run top down, GL texture rows bottom up
+        data = image.transpose(Image.FLIP_TOP_BOTTOM).tobytes()
+        if compress and S3TC_EXTENSION in ctx.extensions:
+            texture = ctx.texture(size, components=4, data=data, compressed=True,
+                                  internal_format=GL_COMPRESSED_RGB_S3TC_DXT1_EXT)
+        else:
+            texture = ctx.texture(size, components=4, data=data)
+        texture.wrap_x = texture.wrap_y = wrap
+        texture.filter = ctx.LINEAR_MIPMAP_LINEAR, ctx.LINEAR
+        texture.build_mipmaps()
+        return texture
+
+    def _backdrop(self, ctx):
+        width, height = self.quad_size
+        size = round(width * self.scale), round(height * self.scale)
+        texture = self._textures.get((self.path, size))
+        if texture is None:
+            texture = self._upload(ctx, registry.texture(self.path).image, size,
+                                   ctx.CLAMP_TO_EDGE, self.compress)
+            self._textures[(self.path, size)] = texture
+        return texture
+
+    def draw(self, offset_x=0.0, offset_y=0.0):
+        """Draw the backdrop and parallax layer shifted by (offset_x, offset_y)"""
+        if self.path is None and self.parallax_image is None:
+            return
+        ctx = arcade.get_window().ctx
+        if self._program is None:
+            self._program = ctx.program(vertex_shader=VERTEX_SHADER,
+                                        fragment_shader=FRAGMENT_SHADER)
+            self._quad = geometry.quad_2d(self.quad_size, (self.width / 2, self.height / 2))
+        program = self._program
+        program["offset"] = offset_x, offset_y
+
+        if self.path is not None:
+            program["uv_scale"] = 1.0, 1.0
+            program["scroll"] = 0.0, 0.0
+            self._backdrop(ctx).use(0)
+            self._quad.render(program)
+
+        image = self.parallax_image
+        if image is not None:
+            if self._parallax is None:
+                self._parallax = self._upload(ctx, image, image.size, ctx.REPEAT)
+            width, height = self.quad_size
+            program["uv_scale"] = width / image.width, height / image.height
+            program["scroll"] = 0.0, self.scroll
+            self._parallax.use(0)
+            ctx.enable(ctx.BLEND)
+            self._quad.render(program)
@@ -0,0 +1,249 @@
+"""Play many seeded headless games in parallel for balance sweeps.
+
+Each game runs on its own SwarmEngine with a bot at the controls until it
+ends (or hits --max-ticks). Games are spread over a process pool, one per
+CPU core by default, and the survival wave, score and kill distributions
+are aggregated at the end. The balance knobs in TUNABLES can be
+overridden, and another waves file swapped in, in every worker to try a
+change without editing the game:
+
+    python batch_sim.py --games 2000 --policy tracker
+    python batch_sim.py --games 2000 --set ALIEN_SPEED_BASE=1.5 --output sweep.json
+    python batch_sim.py --games 2000 --set BOSS_HEALTH_BASE=80 --waves hard_waves.json
+"""
+import argparse
+import ast
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import invader_swarm
+from invader_swarm import SCREEN_HEIGHT, SwarmEngine, sweep_pilot
+from waves import load_waves
+
+MAX_TICKS = 60 * 60 * 10
+
+
+def _set_constant(name):
+    def apply(value):
+        setattr(invader_swarm, name, value)
+    return apply
+
+
+def _set_boss_health(key):
+    def apply(value):
+        invader_swarm.WAVES.boss["health"][key] = value
+    return apply
+
+
+# Balance knobs --set accepts: name -> (type, setter). Boss health lives in
+# the waves file, so its knobs edit the loaded copy.
+TUNABLES = {
+    'PLAYER_SPEED': (float, _set_constant('PLAYER_SPEED')),
+    'ALIEN_SPEED_BASE': (float, _set_constant('ALIEN_SPEED_BASE')),
+    'ALIEN_DROP_DISTANCE_BASE': (float, _set_constant('ALIEN_DROP_DISTANCE_BASE')),
+    'BULLET_SPEED': (float, _set_constant('BULLET_SPEED')),
+    'ALIEN_BULLET_SPEED': (float, _set_constant('ALIEN_BULLET_SPEED')),
+    'ALIEN_SHOOT_DELAY_BASE': (int, _set_constant('ALIEN_SHOOT_DELAY_BASE')),
+    'ALIEN_SHOOT_DELAY_STEP': (int, _set_constant('ALIEN_SHOOT_DELAY_STEP')),
+    'ALIEN_SHOOT_DELAY_MIN': (int, _set_constant('ALIEN_SHOOT_DELAY_MIN')),
+    'BOSS_HEALTH_BASE': (int, _set_boss_health('base')),
+    'BOSS_HEALTH_PER_WAVE': (int, _set_boss_health('per_wave')),
+}
+
+
+def sweep_policy(engine, tick, rng):
+    """The headless pilot: sweep side to side with the trigger held"""
+    sweep_pilot(engine, tick)
+
+
+def random_policy(engine, tick, rng):
+    """Mash keys, holding each choice for a few ticks"""
+    if tick % 10 == 0:
+        engine.left_pressed, engine.right_pressed = rng.choice(
+            ((True, False), (False, True), (False, False)))
+        engine.fire_pressed = rng.random() < 0.8
+
+
+def tracker_policy(engine, tick, rng):
+    """Stay under the lowest alien, or the boss, and keep firing"""
+    engine.fire_pressed = True
+    player_x = engine.player.center_x
+    target_x = player_x
+    if engine.boss:
+        target_x = engine.boss.center_x
+    else:
+        live = engine.formation.live_indices()
+        if len(live):
+            x, y = engine.formation.positions()
+            target_x = x[live[np.argmin(y[live])]]
+    engine.left_pressed = target_x < player_x - 5
+    engine.right_pressed = target_x > player_x + 5
+
+
+POLICIES = {
+    'sweep': sweep_policy,
+    'random': random_policy,
+    'tracker': tracker_policy,
+}
+
+
+def play_game(seed, policy, max_ticks=MAX_TICKS):
+    """Play one game to the end and return its outcome"""
+    engine = SwarmEngine(seed)
+    rng = random.Random(seed)
+    act = POLICIES[policy]
+    tick = 0
+    while not engine.game_over and tick < max_ticks:
+        act(engine, tick, rng)
+        engine.step()
+        tick += 1
+    return {
+        'seed': seed,
+        'wave': engine.wave,
+        'score': engine.score,
+        'kills': engine.kills,
+        'ticks': tick,
+        'finished': engine.game_over,
+    }
+
+
+def apply_settings(overrides, waves=None):
+    """Load `waves` in place of waves.json, then apply --set overrides"""
+    if waves:
+        invader_swarm.WAVES = load_waves(waves, SCREEN_HEIGHT)
+        invader_swarm.ENEMY_TYPES = invader_swarm.WAVES.enemy_types
+    for name, value in overrides.items():
+        TUNABLES[name][1](value)
+
+
+def _init_worker(overrides, waves):
+    # The engine logs every boss spawn; only let warnings through
+    logging.getLogger("invader_swarm").setLevel(logging.WARNING)
+    apply_settings(overrides, waves)
+
+
+def _play_chunk(args):
+    seeds, policy, max_ticks = args
+    return [play_game(seed, policy, max_ticks) for seed in seeds]
+
+
+def parse_override(text):
+    """NAME=VALUE for one of TUNABLES, VALUE a non-negative number of its type"""
+    name, sep, value = text.partition('=')
+    if not sep or name not in TUNABLES:
+        raise argparse.ArgumentTypeError(
+            f"not a tunable assignment: {text} (tunables: {', '.join(TUNABLES)})")
+    kind = TUNABLES[name][0]
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"bad value for {name}: {value}")
+    # bool is an int subclass; ints are fine where a float is wanted
+    numeric = (int, float) if kind is float else (int,)
+    if isinstance(value, bool) or not isinstance(value, numeric) or value < 0:
+        raise argparse.ArgumentTypeError(
+            f"{name} takes a non-negative {kind.__name__}, got {value!r}")
+    return name, kind(value)
+
+
+def distribution(values):
+    values = np.asarray(values, dtype=np.float64)
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'p10': float(np.percentile(values, 10)),
+        'p50': float(np.percentile(values, 50)),
+        'p90': float(np.percentile(values, 90)),
+        'max': float(values.max()),
+    }
+
+
+def run_batch(games, policy, workers=None, first_seed=0, max_ticks=MAX_TICKS,
+              overrides=None, waves=None, chunk=16):
+    """Play `games` games over a process pool; returns (results, seconds)"""
+    seeds = list(range(first_seed, first_seed + games))
+    chunks = [(seeds[i:i + chunk], policy, max_ticks) for i in range(0, games, chunk)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(overrides or {}, waves)) as pool:
+        results = [game for batch in pool.map(_play_chunk, chunks) for game in batch]
+    return results, time.perf_counter() - start
+
+
+def summarize(results):
+    waves = np.array([game['wave'] for game in results])
+    return {
+        'games': len(results),
+        'unfinished': sum(not game['finished'] for game in results),
+        'wave': distribution(waves),
+        'score': distribution([game['score'] for game in results]),
+        'kills': distribution([game['kills'] for game in results]),
+        'ticks': distribution([game['ticks'] for game in results]),
+        # Number of games that ended on each wave
+        'wave_histogram': {int(w): int(n) for w, n in enumerate(np.bincount(waves)) if n},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invader Swarm batch simulator")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--policy', choices=POLICIES, default='tracker')
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU core)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS,
+                        help="give up on games that run longer than this")
+    parser.add_argument('--set', dest='overrides', type=parse_override, action='append',
+                        default=[], metavar='NAME=VALUE',
+                        help="override a balance knob in every worker (repeatable): "
+                        + ", ".join(TUNABLES))
+    parser.add_argument('--waves', metavar='PATH',
+                        help="waves file to play instead of waves.json")
+    parser.add_argument('--output', help="JSON file for the summary and per-game results")
+    args = parser.parse_args()
+
+    overrides = dict(args.overrides)
+    if args.waves:
+        # Fail here rather than in every worker
+        try:
+            load_waves(args.waves, SCREEN_HEIGHT)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"bad waves file {args.waves}: {e}")
+    results, elapsed = run_batch(args.games, args.policy, args.workers, args.seed,
+                                 args.max_ticks, overrides, args.waves)
+    summary = summarize(results)
+    ticks = sum(game['ticks'] for game in results)
+
+    print(f"{summary['games']} games ({args.policy} bot) in {elapsed:.1f}s, "
+          f"{summary['games'] / elapsed:.1f} games/s, {ticks / elapsed:.0f} ticks/s "
+          f"on {args.workers or os.cpu_count()} workers")
+    if overrides:
+        print(f"  overrides: {overrides}")
+    if args.waves:
+        print(f"  waves: {args.waves}")
+    for key in ('wave', 'score', 'kills', 'ticks'):
+        stats = summary[key]
+        print(f"  {key:<6} mean {stats['mean']:9.1f}  p10 {stats['p10']:9.1f}  "
+              f"p50 {stats['p50']:9.1f}  p90 {stats['p90']:9.1f}  max {stats['max']:9.1f}")
+    print("  final wave: " + ", ".join(f"{wave}: {count}"
+                                       for wave, count in summary['wave_histogram'].items()))
+    if summary['unfinished']:
+        print(f"  {summary['unfinished']} games hit --max-ticks")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'policy': args.policy, 'overrides': overrides, 'waves': args.waves,
+                       'seconds': elapsed,
+                       'summary': summary, 'games': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import arcade
+from arcade.gl import BufferDescription
+
+
+class TriangleBatch:
+    """Draws interleaved x, y, r, g, b, a float32 vertices as triangles.
+
+    Owns the GPU buffer and geometry, created on first draw and replaced
+    only when a frame's vertices outgrow them, so callers just fill a
+    NumPy array and hand it over: one upload and one draw call per frame.
+    """
+    def __init__(self):
+        self._buffer = None
+        self._geometry = None
+
+    def draw(self, vertices, reserve=0):
+        """Upload and draw `vertices`; a new buffer gets at least `reserve` bytes"""
+        count = vertices.size // 6
+        if count == 0:
+            return
+        ctx = arcade.get_window().ctx
+        if self._buffer is None or self._buffer.size < vertices.nbytes:
+            self._buffer = ctx.buffer(reserve=max(vertices.nbytes, reserve))
+            self._geometry = ctx.geometry(
+                [BufferDescription(self._buffer, "2f 4f", ["in_vert", "in_color"])]
+            )
+        self._buffer.write(vertices)
+
+        ctx.enable(ctx.BLEND)
+        self._geometry.render(
+            ctx.line_generic_with_colors_program,
+            mode=ctx.TRIANGLES,
+            vertices=count
+        )
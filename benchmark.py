@@ -0,0 +1,271 @@
+"""Benchmark scenarios for the Invader Swarm simulation.
+
+Runs reproducible, seeded scenarios on the headless SwarmEngine and
+records per-tick latency for the hot paths. Results are written to JSON
+so runs from different releases can be compared.
+
+    python benchmark.py --ticks 1200 --output benchmark_results.json
+    python benchmark.py boss nuke_storm
+    python benchmark.py --replay bad_frames.isr
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import defaultdict
+
+import arcade
+import numpy as np
+
+from bullets import BulletBatch
+from invader_swarm import (SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_BULLET_W, PLAYER_BULLET_H,
+                           ALIEN_BULLET_W, ALIEN_BULLET_H, SwarmEngine, sweep_pilot)
+from replay import Replay, apply_input
+
+DRIFTER_COUNT = 80
+
+
+class StageTimer:
+    """Collects wall-clock samples for named stages"""
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, name, func):
+        samples = self.samples[name]
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - start)
+        return timed
+
+    def clear(self):
+        for samples in self.samples.values():
+            samples.clear()
+
+    def summary(self):
+        result = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ms = np.array(samples) * 1000
+            result[name] = {
+                'samples': len(ms),
+                'mean_ms': float(ms.mean()),
+                'p50_ms': float(np.percentile(ms, 50)),
+                'p90_ms': float(np.percentile(ms, 90)),
+                'p99_ms': float(np.percentile(ms, 99)),
+                'max_ms': float(ms.max()),
+            }
+        return result
+
+
+PLAYER_BULLET_BATCH = BulletBatch(PLAYER_BULLET_W, PLAYER_BULLET_H, arcade.color.WHITE_SMOKE)
+ALIEN_BULLET_BATCH = BulletBatch(ALIEN_BULLET_W, ALIEN_BULLET_H, arcade.color.RED)
+
+
+def prepare_draw(engine):
+    """CPU-side work the renderer does before issuing any draw call"""
+    engine.particles.build_vertices()
+    PLAYER_BULLET_BATCH.build_vertices(engine.player_bullets)
+    ALIEN_BULLET_BATCH.build_vertices(engine.alien_bullets)
+
+
+def make_invulnerable(engine):
+    engine.effects.activate('shield', 10 ** 9)
+
+
+def top_up_drifters(engine, count=DRIFTER_COUNT):
+    """Keep `count` drifters on screen, spread along the top"""
+    while len(engine.drifters) < count:
+        x = engine.rng.uniform(40, SCREEN_WIDTH - 40)
+        y = engine.rng.uniform(SCREEN_HEIGHT - 250, SCREEN_HEIGHT - 60)
+        engine.spawn_drifter(x, y)
+
+
+def jump_to_wave(engine, wave):
+    engine.wave = wave
+    engine.setup_aliens()
+    engine.alien_direction = 1
+
+
+# Each scenario is (setup, refresh). setup(engine) runs once, refresh(engine, tick)
+# runs before every tick, outside the timed region, to hold the scenario steady.
+
+def wave1_setup(engine):
+    pass
+
+def wave1_refresh(engine, tick):
+    if engine.game_over:
+        engine.restart()
+    sweep_pilot(engine, tick)
+
+
+def max_grid_setup(engine):
+    # Wave 9 is the first non-boss wave with the full 5x11 grid
+    make_invulnerable(engine)
+    jump_to_wave(engine, 9)
+    top_up_drifters(engine)
+
+def max_grid_refresh(engine, tick):
+    if engine.game_over:
+        engine.restart()
+        max_grid_setup(engine)
+    elif engine.wave != 9 or len(engine.aliens) < 30:
+        jump_to_wave(engine, 9)
+    make_invulnerable(engine)
+    top_up_drifters(engine)
+    sweep_pilot(engine, tick)
+
+
+def boss_setup(engine):
+    make_invulnerable(engine)
+    jump_to_wave(engine, 10)
+    engine.boss.health = engine.boss.max_health = 10 ** 9
+    # A volley every few ticks keeps the screen full of boss bullets
+    engine.boss.shoot_delay = 3
+
+def boss_refresh(engine, tick):
+    if engine.game_over or not engine.boss:
+        engine.restart()
+        boss_setup(engine)
+    make_invulnerable(engine)
+    sweep_pilot(engine, tick)
+
+
+def nuke_storm_setup(engine):
+    make_invulnerable(engine)
+
+def nuke_storm_refresh(engine, tick):
+    if engine.game_over:
+        engine.restart()
+        nuke_storm_setup(engine)
+    make_invulnerable(engine)
+    # Particles live 30 ticks, so a nuke every 30 ticks keeps the storm going
+    if tick % 30 == 0:
+        jump_to_wave(engine, 8)
+        top_up_drifters(engine)
+        engine.nuke()
+    sweep_pilot(engine, tick)
+
+
+SCENARIOS = {
+    'wave1': (wave1_setup, wave1_refresh),
+    'max_grid': (max_grid_setup, max_grid_refresh),
+    'boss': (boss_setup, boss_refresh),
+    'nuke_storm': (nuke_storm_setup, nuke_storm_refresh),
+}
+
+
+def instrument(engine):
+    """Wrap the hot paths in stage timers; returns (timer, step, draw_prep)"""
+    timer = StageTimer()
+    engine.handle_collisions = timer.wrap('handle_collisions', engine.handle_collisions)
+    engine.particles.update = timer.wrap('particles', engine.particles.update)
+    step = timer.wrap('step', engine.step)
+    draw_prep = timer.wrap('draw_prep', prepare_draw)
+    return timer, step, draw_prep
+
+
+def track_peaks(peaks, engine):
+    peaks['aliens'] = max(peaks['aliens'], len(engine.aliens))
+    peaks['drifters'] = max(peaks['drifters'], len(engine.drifters))
+    peaks['bullets'] = max(peaks['bullets'],
+                           len(engine.player_bullets) + len(engine.alien_bullets))
+    peaks['particles'] = max(peaks['particles'], len(engine.particles))
+
+
+def run_scenario(name, ticks, seed, warmup=60):
+    """Run one scenario and return its latency summary"""
+    setup, refresh = SCENARIOS[name]
+    engine = SwarmEngine(seed)
+    setup(engine)
+    timer, step, draw_prep = instrument(engine)
+
+    peaks = defaultdict(int)
+    for tick in range(warmup + ticks):
+        if tick == warmup:
+            timer.clear()
+        refresh(engine, tick)
+        step()
+        draw_prep(engine)
+        track_peaks(peaks, engine)
+
+    return {
+        'ticks': ticks,
+        'stages': timer.summary(),
+        'peak_entities': dict(peaks),
+    }
+
+
+def run_replay(path):
+    """Time a recorded game tick for tick, e.g. one attached to a bad-frame report"""
+    replay = Replay.load(path)
+    engine = SwarmEngine(replay.seed)
+    timer, step, draw_prep = instrument(engine)
+
+    peaks = defaultdict(int)
+    for mask in replay.inputs:
+        apply_input(engine, mask)
+        step()
+        draw_prep(engine)
+        track_peaks(peaks, engine)
+
+    return {
+        'ticks': len(replay),
+        'seed': replay.seed,
+        'stages': timer.summary(),
+        'peak_entities': dict(peaks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invader Swarm benchmark suite")
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--ticks', type=int, default=1200,
+                        help="measured ticks per scenario")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="JSON file to write the results to")
+    parser.add_argument('--replay', action='append', default=[], metavar='PATH',
+                        help="also time a recorded replay (repeatable)")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'arcade': arcade.version.VERSION,
+            'numpy': np.__version__,
+            'seed': args.seed,
+        },
+        'scenarios': {},
+    }
+
+    runs = [(name, lambda name=name: run_scenario(name, args.ticks, args.seed))
+            for name in args.scenarios or ([] if args.replay else SCENARIOS)]
+    runs += [(f"replay:{path}", lambda path=path: run_replay(path)) for path in args.replay]
+
+    for name, run in runs:
+        result = run()
+        results['scenarios'][name] = result
+        print(f"\n{name} ({result['ticks']} ticks, peaks {result['peak_entities']})")
+        print(f"  {'stage':<18} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (ms)")
+        for stage, stats in result['stages'].items():
+            print(f"  {stage:<18} {stats['mean_ms']:8.3f} {stats['p50_ms']:8.3f} "
+                  f"{stats['p90_ms']:8.3f} {stats['p99_ms']:8.3f} {stats['max_ms']:8.3f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
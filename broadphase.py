@@ -0,0 +1,105 @@
+import numpy as np
+
+# Cell coordinates are biased into a non-negative range and packed into a
+# single int64 key, so objects slightly off screen still hash correctly.
+_CELL_BIAS = 1 << 20
+_CELL_STRIDE = 1 << 21
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+def rect_bounds(cx, cy, w, h):
+    """(left, bottom, right, top) arrays for same-sized centered rectangles"""
+    cx = np.asarray(cx, dtype=np.float64)
+    cy = np.asarray(cy, dtype=np.float64)
+    return cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2
+
+
+def sprite_bounds(sprites):
+    """(left, bottom, right, top) arrays for a sequence of sprites"""
+    n = len(sprites)
+    bounds = np.empty((4, n), dtype=np.float64)
+    for i, sprite in enumerate(sprites):
+        bounds[:, i] = (sprite.left, sprite.bottom, sprite.right, sprite.top)
+    return bounds[0], bounds[1], bounds[2], bounds[3]
+
+
+def hit_box_extents(sprite):
+    """(left, bottom, right, top) of a sprite's hit box relative to its center
+
+    Adding a center position to these gives exactly the sprite's own
+    left/bottom/right/top there, so positions can live in arrays.
+    """
+    scale_x, scale_y = sprite.scale
+    xs = [x * scale_x for x, _ in sprite.hit_box.points]
+    ys = [y * scale_y for _, y in sprite.hit_box.points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _expand_ranges(starts, counts):
+    """Concatenate arange(start, start + count) for every range"""
+    total = int(counts.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets
+
+
+class UniformGrid:
+    """Uniform-grid broadphase over axis-aligned rectangles.
+
+    `build` hashes a set of target rectangles into square cells, `query`
+    returns the (query, target) index pairs that share at least one cell.
+    Only those pairs need an exact overlap test. Both steps are vectorized,
+    so rebuilding the grid every frame is cheap.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.size = 0
+        self._keys = _EMPTY
+        self._owners = _EMPTY
+
+    def _cells(self, left, bottom, right, top):
+        """Every (owner, cell key) pair covered by the given rectangles"""
+        x0 = np.floor(np.asarray(left) / self.cell_size).astype(np.int64)
+        y0 = np.floor(np.asarray(bottom) / self.cell_size).astype(np.int64)
+        x1 = np.floor(np.asarray(right) / self.cell_size).astype(np.int64)
+        y1 = np.floor(np.asarray(top) / self.cell_size).astype(np.int64)
+        nx = x1 - x0 + 1
+        counts = nx * (y1 - y0 + 1)
+
+        owners = np.repeat(np.arange(len(x0)), counts)
+        local = _expand_ranges(np.zeros(len(x0), dtype=np.int64), counts)
+        nx = nx[owners]
+        cx = x0[owners] + local % nx
+        cy = y0[owners] + local // nx
+        keys = (cx + _CELL_BIAS) * _CELL_STRIDE + (cy + _CELL_BIAS)
+        return owners, keys
+
+    def build(self, left, bottom, right, top):
+        """Rebuild the grid from target rectangle bounds"""
+        self.size = len(left)
+        if self.size == 0:
+            self._keys = self._owners = _EMPTY
+            return
+        owners, keys = self._cells(left, bottom, right, top)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._owners = owners[order]
+
+    def query(self, left, bottom, right, top):
+        """Candidate (query_index, target_index) arrays, sorted by query then target"""
+        if self.size == 0 or len(left) == 0:
+            return _EMPTY, _EMPTY
+
+        owners, keys = self._cells(left, bottom, right, top)
+        lo = np.searchsorted(self._keys, keys, side="left")
+        hi = np.searchsorted(self._keys, keys, side="right")
+        counts = hi - lo
+        if not counts.any():
+            return _EMPTY, _EMPTY
+
+        query_idx = np.repeat(owners, counts)
+        target_idx = self._owners[_expand_ranges(lo, counts)]
+
+        # A pair sharing several cells is reported once
+        codes = np.unique(query_idx * self.size + target_idx)
+        return codes // self.size, codes % self.size
@@ -0,0 +1,182 @@
+import numpy as np
+
+from batches import TriangleBatch
+
+# Two triangles per bullet, a unit rectangle scaled to the bullet size
+_RECT_CORNERS = np.array([
+    (-0.5, -0.5), (0.5, -0.5), (0.5, 0.5),
+    (-0.5, -0.5), (0.5, 0.5), (-0.5, 0.5)
+], dtype=np.float32)
+_VERTS_PER_BULLET = len(_RECT_CORNERS)
+_STATE_ARRAYS = ("x", "y", "vx", "vy", "active")
+_DTYPES = {"active": bool}
+
+
+class BulletPool:
+    """Array-backed store for one kind of projectile.
+
+    Bullets are packed into slots [0, count) of contiguous position and
+    velocity arrays, so a tick moves every bullet with one vectorized add.
+    Bullets spawned without a velocity fall straight at the pool's `speed`.
+    Collision code marks hits with `kill`, which only clears the bullet's
+    active flag, and `sweep` then drops every inactive bullet in one
+    vectorized step. `remove` is an immediate O(1) swap-remove for the odd
+    single hit.
+    """
+    def __init__(self, speed, capacity=256):
+        self.speed = speed
+        self.count = 0
+        self.capacity = capacity
+        for name in _STATE_ARRAYS:
+            setattr(self, name, np.zeros(capacity, dtype=_DTYPES.get(name, np.float64)))
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        n = self.count
+        for name in _STATE_ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        n = self.count
+        return zip(self.x[:n].tolist(), self.y[:n].tolist())
+
+    def clear(self):
+        self.count = 0
+
+    def get_state(self):
+        """Copies of the live bullet arrays, by name"""
+        n = self.count
+        return {name: getattr(self, name)[:n].copy() for name in _STATE_ARRAYS}
+
+    def set_state(self, state):
+        """Load arrays from `get_state`; missing velocities mean plain straight shots"""
+        n = len(state['x'])
+        if n > self.capacity:
+            self._grow(n)
+        defaults = {'vx': 0.0, 'vy': self.speed}
+        for name in _STATE_ARRAYS:
+            getattr(self, name)[:n] = state[name] if name in state else defaults[name]
+        self.count = n
+
+    def spawn(self, x, y, vx=0.0, vy=None):
+        """Add a single bullet"""
+        n = self.count
+        if n == self.capacity:
+            self._grow(n + 1)
+        self.x[n] = x
+        self.y[n] = y
+        self.vx[n] = vx
+        self.vy[n] = self.speed if vy is None else vy
+        self.active[n] = True
+        self.count = n + 1
+
+    def spawn_many(self, xs, ys, vxs=0.0, vys=None):
+        """Add a volley of bullets from coordinate sequences
+
+        Velocities may be sequences or one value for the whole volley.
+        """
+        start = self.count
+        end = start + len(xs)
+        if end > self.capacity:
+            self._grow(end)
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.vx[start:end] = vxs
+        self.vy[start:end] = self.speed if vys is None else vys
+        self.active[start:end] = True
+        self.count = end
+
+    def move(self):
+        n = self.count
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+    def kill(self, index):
+        """Flag a bullet for removal on the next `sweep`"""
+        self.active[index] = False
+
+    def remove(self, index):
+        """Remove a bullet immediately by moving the last one into its slot"""
+        last = self.count - 1
+        for name in _STATE_ARRAYS:
+            array = getattr(self, name)
+            array[index] = array[last]
+        self.count = last
+
+    def sweep(self):
+        """Compact away every bullet that is no longer active"""
+        n = self.count
+        keep = self.active[:n].copy()
+        if keep.all():
+            return
+        m = int(keep.sum())
+        for name in _STATE_ARRAYS:
+            array = getattr(self, name)
+            array[:m] = array[:n][keep]
+        self.count = m
+
+    def cull(self, bottom=-np.inf, top=np.inf, left=-np.inf, right=np.inf):
+        """Remove bullets that left the open box (left, right) x (bottom, top)"""
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        self.active[:n] &= (y > bottom) & (y < top) & (x > left) & (x < right)
+        self.sweep()
+
+
+class BulletBatch:
+    """Draws every bullet of a pool as solid rectangles in one draw call.
+
+    Vertex data lives in a preallocated array whose color columns are
+    filled once, so each frame only the positions are rewritten, in bulk,
+    before a single upload and render.
+    """
+    def __init__(self, width, height, color, capacity=256):
+        self.corners = _RECT_CORNERS * np.array([width, height], dtype=np.float32)
+        self.color = tuple(color) + (255,) * (4 - len(color))
+        self._allocate(capacity)
+
+        self._batch = TriangleBatch()
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self._vertices = np.zeros((capacity, _VERTS_PER_BULLET, 6), dtype=np.float32)
+        self._vertices[:, :, 2:] = self.color
+
+    def build_vertices(self, pool, alpha=1.0):
+        """Pack the pool's bullets into interleaved x, y, r, g, b, a vertex data
+
+        With `alpha` below 1 bullets are drawn that far between the previous
+        tick and this one.
+        """
+        n = len(pool)
+        if n > self.capacity:
+            capacity = self.capacity
+            while capacity < n:
+                capacity *= 2
+            self._allocate(capacity)
+        verts = self._vertices[:n]
+        lag = 1 - alpha
+        verts[:, :, 0] = (pool.x[:n, None] - lag * pool.vx[:n, None]) + self.corners[:, 0]
+        verts[:, :, 1] = (pool.y[:n, None] - lag * pool.vy[:n, None]) + self.corners[:, 1]
+        return verts
+
+    def draw(self, pool, alpha=1.0):
+        n = len(pool)
+        if n == 0:
+            return
+
+        verts = self.build_vertices(pool, alpha)
+        self._batch.draw(verts, self._vertices.nbytes)
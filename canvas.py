@@ -0,0 +1,124 @@
+"""Offscreen framebuffer the game renders into, scaled up to the window."""
+import arcade
+from arcade.gl import geometry
+from arcade.types import LBWH, LRBT
+
+VERTEX_SHADER = """
+#version 330
+
+uniform vec4 uv_rect;
+
+in vec2 in_vert;
+in vec2 in_uv;
+
+out vec2 v_uv;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    v_uv = uv_rect.xy + in_uv * uv_rect.zw;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D frame;
+
+in vec2 v_uv;
+
+out vec4 f_color;
+
+void main() {
+    f_color = vec4(texture(frame, v_uv).rgb, 1.0);
+}
+"""
+
+
+class Canvas:
+    """Renders a fixed logical playfield at a chosen internal resolution.
+
+    Everything between `begin` and `present` draws into an offscreen
+    framebuffer using playfield coordinates (0..width, 0..height), at
+    `scale` pixels per unit: below 1 for slow machines, above 1 to
+    supersample. `present` stretches the frame onto the window, keeping
+    its aspect ratio with black bars, so the window can be any size or
+    full screen.
+
+    The framebuffer holds `margin` units more than the playfield on every
+    side, and `present` can show the playfield shifted by up to that much,
+    which is how screen shake moves the whole frame without touching any
+    draw call.
+
+    GL objects are created on first use, like the bullet batches.
+    """
+    def __init__(self, width, height, scale=1.0, margin=0):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.margin = margin
+        self.size = (round((width + 2 * margin) * scale),
+                     round((height + 2 * margin) * scale))
+        self._framebuffer = None
+        self._camera = None
+        self._screen_camera = None
+        self._program = None
+        self._quad = None
+
+    def _create(self, ctx):
+        texture = ctx.texture(self.size, components=4)
+        texture.filter = ctx.LINEAR, ctx.LINEAR
+        self._framebuffer = ctx.framebuffer(color_attachments=[texture])
+        half_width = self.width / 2 + self.margin
+        half_height = self.height / 2 + self.margin
+        self._camera = arcade.Camera2D(
+            viewport=LBWH(0, 0, *self.size),
+            position=(self.width / 2, self.height / 2),
+            projection=LRBT(-half_width, half_width, -half_height, half_height),
+            render_target=self._framebuffer,
+        )
+        self._screen_camera = arcade.Camera2D(
+            position=(self.width / 2, self.height / 2),
+            projection=LRBT(-self.width / 2, self.width / 2,
+                            -self.height / 2, self.height / 2),
+        )
+        self._program = ctx.program(vertex_shader=VERTEX_SHADER,
+                                    fragment_shader=FRAGMENT_SHADER)
+        self._quad = geometry.quad_2d_fs()
+
+    def viewport(self):
+        """(left, bottom, width, height) of the playfield on the window, in pixels"""
+        window_width, window_height = arcade.get_window().get_framebuffer_size()
+        fit = min(window_width / self.width, window_height / self.height)
+        width = round(self.width * fit)
+        height = round(self.height * fit)
+        return (window_width - width) // 2, (window_height - height) // 2, width, height
+
+    def begin(self, color=arcade.color.BLACK):
+        """Clear the framebuffer and direct drawing into it"""
+        ctx = arcade.get_window().ctx
+        if self._framebuffer is None:
+            self._create(ctx)
+        self._camera.use()
+        self._framebuffer.clear(color=color)
+
+    def present(self, offset_x=0, offset_y=0):
+        """Show the frame on the window, shifted by (offset_x, offset_y) units
+
+        Drawing after this goes straight to the window, still in playfield
+        coordinates, for anything that should stay sharp (debug overlays).
+        """
+        ctx = arcade.get_window().ctx
+        full_width = self.width + 2 * self.margin
+        full_height = self.height + 2 * self.margin
+        self._program["uv_rect"] = ((self.margin - offset_x) / full_width,
+                                    (self.margin - offset_y) / full_height,
+                                    self.width / full_width, self.height / full_height)
+
+        ctx.screen.use()
+        ctx.screen.clear(color=arcade.color.BLACK)
+        self._screen_camera.viewport = LBWH(*self.viewport())
+        self._screen_camera.use()
+        self._framebuffer.color_attachments[0].use(0)
+        ctx.disable(ctx.BLEND)
+        self._quad.render(self._program)
+        ctx.enable(ctx.BLEND)
@@ -0,0 +1,42 @@
+import numpy as np
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+def aabb_overlap(a, b, a_idx, b_idx):
+    """Strict overlap test for the rectangle pairs (a[a_idx], b[b_idx]).
+
+    `a` and `b` are (left, bottom, right, top) tuples of arrays.
+    """
+    a_left, a_bottom, a_right, a_top = a
+    b_left, b_bottom, b_right, b_top = b
+    return ((a_left[a_idx] < b_right[b_idx]) & (a_right[a_idx] > b_left[b_idx]) &
+            (a_bottom[a_idx] < b_top[b_idx]) & (a_top[a_idx] > b_bottom[b_idx]))
+
+
+def first_hits(a, b, pairs=None):
+    """Hit pairs between rectangle sets `a` (bullets) and `b` (targets).
+
+    Each `a` rectangle hits at most one target, the lowest-indexed one it
+    overlaps. `pairs` restricts the test to broadphase candidates sorted by
+    `a` index; without it every combination is tested. Returns the
+    (a_index, b_index) arrays of the hits, ordered by `a` index.
+    """
+    if pairs is None:
+        n, m = len(a[0]), len(b[0])
+        if n == 0 or m == 0:
+            return _EMPTY, _EMPTY
+        a_idx = np.repeat(np.arange(n), m)
+        b_idx = np.tile(np.arange(m), n)
+    else:
+        a_idx, b_idx = pairs
+        if len(a_idx) == 0:
+            return _EMPTY, _EMPTY
+
+    hit = aabb_overlap(a, b, a_idx, b_idx)
+    a_idx = a_idx[hit]
+    b_idx = b_idx[hit]
+
+    # Pairs are sorted by a, then b: the first entry per a is its hit
+    a_idx, first = np.unique(a_idx, return_index=True)
+    return a_idx, b_idx[first]
@@ -0,0 +1,91 @@
+import heapq
+
+# How `activate` treats an effect that is already running
+REPLACE = "replace"    # restart the timer at the new duration
+EXTEND = "extend"      # add the new duration to what is left
+LONGEST = "longest"    # keep whichever timer ends later
+
+
+class EffectScheduler:
+    """Timed effects keyed by name, expired from a min-heap of end ticks.
+
+    `advance` moves the clock one tick and pops only the effects that end
+    on it, so per-tick cost doesn't grow with the number of effects
+    running. Each effect carries a value (True for plain on/off effects,
+    the factor for a multiplier). `version` changes whenever an effect
+    starts, stops or changes, so observers can skip work until it moves.
+
+    Re-activating an effect leaves its old heap entry behind; entries are
+    checked against the current end tick when they come up and stale ones
+    are dropped.
+    """
+    def __init__(self):
+        self.now = 0
+        self.version = 0
+        self._ends = {}
+        self._values = {}
+        self._heap = []
+
+    def clear(self):
+        self._ends.clear()
+        self._values.clear()
+        self._heap.clear()
+        self.version += 1
+
+    def activate(self, name, duration, value=True, stack=REPLACE):
+        """Run `name` for `duration` ticks from now"""
+        end = self.now + duration
+        current = self._ends.get(name)
+        if current is not None:
+            if stack == EXTEND:
+                end = current + duration
+            elif stack == LONGEST:
+                end = max(end, current)
+        if current != end:
+            self._ends[name] = end
+            heapq.heappush(self._heap, (end, name))
+        self._values[name] = value
+        self.version += 1
+
+    def cancel(self, name):
+        if self._ends.pop(name, None) is not None:
+            del self._values[name]
+            self.version += 1
+
+    def advance(self):
+        """Step one tick; returns the names of the effects that ran out"""
+        self.now += 1
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            end, name = heapq.heappop(heap)
+            if self._ends.get(name) == end:
+                del self._ends[name]
+                del self._values[name]
+                expired.append(name)
+        if expired:
+            self.version += 1
+        return expired
+
+    def active(self, name):
+        return name in self._ends
+
+    def value(self, name, default=None):
+        return self._values.get(name, default)
+
+    def remaining(self, name):
+        """Ticks left on `name`, 0 if it isn't running"""
+        end = self._ends.get(name)
+        return end - self.now if end is not None else 0
+
+    def get_state(self):
+        """(now, [(name, end tick, value)]) for snapshots"""
+        return self.now, [(name, end, self._values[name]) for name, end in self._ends.items()]
+
+    def set_state(self, now, effects):
+        self.now = now
+        self._ends = {name: end for name, end, _ in effects}
+        self._values = {name: value for name, _, value in effects}
+        self._heap = [(end, name) for name, end, _ in effects]
+        heapq.heapify(self._heap)
+        self.version += 1
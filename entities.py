@@ -0,0 +1,90 @@
+import numpy as np
+
+
+class EntityStore:
+    """Struct-of-arrays storage for a kind of short-lived game entity.
+
+    Every component is a NumPy array attribute with one row per entity,
+    packed into rows [0, count) in spawn order, so systems update and test
+    all entities with whole-array operations. Each entity also gets an
+    integer id that stays valid until it dies; `row` finds an entity's
+    current row from its id in O(1), and is None once it is gone.
+
+    As with BulletPool, `kill` only flags an entity and `sweep` compacts
+    the dead ones away in one step, so rows found before a sweep stay
+    valid until it runs.
+    """
+    def __init__(self, components, capacity=64):
+        self.components = dict(components, id=np.int64, alive=bool)
+        self.capacity = capacity
+        self.count = 0
+        self.next_id = 0
+        self._rows = {}
+        for name, dtype in self.components.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        n = self.count
+        for name in self.components:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, **values):
+        """Add an entity with the given component values; returns its id"""
+        n = self.count
+        if n == self.capacity:
+            self._grow(n + 1)
+        for name, value in values.items():
+            getattr(self, name)[n] = value
+        entity = self.next_id
+        self.next_id += 1
+        self.id[n] = entity
+        self.alive[n] = True
+        self._rows[entity] = n
+        self.count = n + 1
+        return entity
+
+    def row(self, entity):
+        """Current row of a live entity, or None"""
+        n = self._rows.get(entity)
+        if n is None or not self.alive[n]:
+            return None
+        return n
+
+    def kill(self, rows):
+        """Flag entities (by row) for removal on the next `sweep`"""
+        self.alive[rows] = False
+
+    def sweep(self):
+        """Compact away every dead entity, keeping spawn order"""
+        n = self.count
+        keep = self.alive[:n].copy()
+        if keep.all():
+            return
+        m = int(keep.sum())
+        for name in self.components:
+            array = getattr(self, name)
+            array[:m] = array[:n][keep]
+            # Zeroed so object components let go of what they held
+            array[m:n] = 0
+        self.count = m
+        self._rows = dict(zip(self.id[:m].tolist(), range(m)))
+
+    def clear(self):
+        for name in self.components:
+            getattr(self, name)[:self.count] = 0
+        self.count = 0
+        self._rows.clear()
+
+    def view(self, name):
+        """The live rows of a component"""
+        return getattr(self, name)[:self.count]
@@ -0,0 +1,166 @@
+import numpy as np
+
+from interpolation import slot_of, write_positions
+
+
+class Formation:
+    """Movement state for the regular alien grid.
+
+    Aliens sharing a speed multiplier move in lockstep, so each speed class
+    only needs one horizontal offset, and the swarm's edges are the cached
+    hit-box extents of each class shifted by that offset. Edge checks are
+    then O(1) per frame. Positions are kept in arrays and written straight
+    into the SpriteList position buffer in one step; a sprite's own position
+    is only brought up to date with `sync` when gameplay code needs it.
+
+    Aliens are addressed by their index in the grid as laid out; `alive`
+    and `kind` are per-alien arrays, so liveness is an O(1) lookup.
+    """
+    def __init__(self):
+        self.reset(())
+
+    def reset(self, sprite_list, kinds=(), speeds=()):
+        """Capture the starting layout of a freshly built alien grid
+
+        `kinds` and `speeds` give each sprite's enemy kind and horizontal
+        speed multiplier, in list order.
+        """
+        self.sprites = list(sprite_list)
+        n = len(self.sprites)
+        # Same sprites as an array, so a mask picks them without a Python loop
+        self.sprite_array = np.empty(n, dtype=object)
+        self.sprite_array[:] = self.sprites
+        self.kind = np.zeros(n, dtype=np.uint8)
+        self.kind[:len(kinds)] = kinds
+
+        self.home_x = np.zeros(n)
+        self.home_y = np.zeros(n)
+        # Hit-box extents relative to the sprite center
+        self.left = np.zeros(n)
+        self.right = np.zeros(n)
+        self.bottom = np.zeros(n)
+        self.top = np.zeros(n)
+        mult = np.ones(n)
+        mult[:len(speeds)] = speeds
+        self.slots = np.zeros(n, dtype=np.int64)
+
+        for i, sprite in enumerate(self.sprites):
+            x, y = sprite.position
+            self.home_x[i] = x
+            self.home_y[i] = y
+            self.left[i] = sprite.left - x
+            self.right[i] = sprite.right - x
+            self.bottom[i] = sprite.bottom - y
+            self.top[i] = sprite.top - y
+            self.slots[i] = slot_of(sprite_list, sprite)
+
+        self.alive = np.ones(n, dtype=bool)
+        self.class_mult, self.speed_class = np.unique(mult, return_inverse=True)
+        self.offset = np.zeros(len(self.class_mult))
+        self.velocity = 0.0
+        self.drop = 0.0
+        # State at the start of the last tick, for render interpolation
+        self.prev_offset = self.offset.copy()
+        self.prev_drop = 0.0
+        self._update_extents()
+
+    def _update_extents(self):
+        """Recompute each speed class's outermost home edges over live aliens"""
+        k = len(self.class_mult)
+        self.class_left = np.full(k, np.inf)
+        self.class_right = np.full(k, -np.inf)
+        alive = self.alive
+        np.minimum.at(self.class_left, self.speed_class[alive],
+                      (self.home_x + self.left)[alive])
+        np.maximum.at(self.class_right, self.speed_class[alive],
+                      (self.home_x + self.right)[alive])
+        self.lowest = (self.home_y + self.bottom)[alive].min() if alive.any() else np.inf
+
+    def kill(self, i):
+        """Drop a destroyed alien from the formation"""
+        self.alive[i] = False
+        self._update_extents()
+
+    def advance(self, speed, direction, width):
+        """Move one frame and report whether the swarm touched a screen edge
+
+        Like per-sprite `change_x`, the velocity set this frame is applied on
+        the next one.
+        """
+        self.prev_offset[:] = self.offset
+        self.prev_drop = self.drop
+        self.offset += self.velocity * self.class_mult
+        self.velocity = speed * direction
+        if direction > 0:
+            return bool((self.class_right + self.offset).max(initial=-np.inf) >= width)
+        return bool((self.class_left + self.offset).min(initial=np.inf) <= 0)
+
+    def descend(self, distance):
+        self.drop += distance
+
+    def lowest_bottom(self):
+        """Bottom edge of the lowest live alien"""
+        return self.lowest - self.drop
+
+    def positions(self, alpha=1.0):
+        """Center positions of every alien, live or not
+
+        `alpha` below 1 blends back towards the previous tick's positions.
+        """
+        offset = self.offset
+        drop = self.drop
+        if alpha < 1:
+            offset = self.prev_offset + alpha * (offset - self.prev_offset)
+            drop = self.prev_drop + alpha * (drop - self.prev_drop)
+        x = self.home_x + offset[self.speed_class]
+        y = self.home_y - drop
+        return x, y
+
+    def bounds(self):
+        """(left, bottom, right, top) arrays of the live aliens, in list order"""
+        x, y = self.positions()
+        alive = self.alive
+        return ((x + self.left)[alive], (y + self.bottom)[alive],
+                (x + self.right)[alive], (y + self.top)[alive])
+
+    def live_indices(self):
+        """Formation indices of the live aliens, in list order"""
+        return np.flatnonzero(self.alive)
+
+    def get_state(self):
+        """(alive, offset, prev_offset, [velocity, drop, prev_drop]) arrays"""
+        return (self.alive.copy(), self.offset.copy(), self.prev_offset.copy(),
+                np.array([self.velocity, self.drop, self.prev_drop]))
+
+    def set_state(self, alive, offset, prev_offset, motion):
+        """Resume from `get_state` output on a formation reset with the same grid"""
+        self.alive[:] = alive
+        self.offset[:] = offset
+        self.prev_offset[:] = prev_offset
+        self.velocity, self.drop, self.prev_drop = (float(v) for v in motion)
+        self._update_extents()
+
+    def relink(self, sprite_list):
+        """Refresh buffer slots after live aliens were re-added to the list"""
+        for i in np.flatnonzero(self.alive).tolist():
+            self.slots[i] = slot_of(sprite_list, self.sprites[i])
+
+    def sync(self, i):
+        """Bring alien `i`'s sprite position up to date and return the sprite"""
+        sprite = self.sprites[i]
+        sprite.position = (float(self.home_x[i] + self.offset[self.speed_class[i]]),
+                           float(self.home_y[i] - self.drop))
+        return sprite
+
+    def sync_all(self):
+        for i in np.flatnonzero(self.alive).tolist():
+            self.sync(i)
+
+    def apply(self, sprite_list, alpha=1.0):
+        """Write live alien positions into the SpriteList's position buffer"""
+        alive = self.alive
+        if not alive.any():
+            return
+        x, y = self.positions(alpha)
+        write_positions(sprite_list, self.slots[alive], x[alive], y[alive],
+                        self.sprite_array[alive])
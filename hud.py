@@ -0,0 +1,119 @@
+import arcade
+from pyglet.graphics import Batch
+
+POWERUP_SLOTS = 3
+# Timed effects listed under the stats, in display order
+POWERUP_LABELS = (
+    ("rapidfire", "RAPID FIRE", arcade.color.YELLOW),
+    ("spread", "SPREAD SHOT", arcade.color.ORANGE),
+    ("shield", "SHIELD", arcade.color.BLUE),
+)
+HIGH_SCORE_SLOTS = 5
+
+
+class Hud:
+    """Retained-mode text for the in-game UI.
+
+    Every label is a persistent `arcade.Text` living in a pyglet batch, so
+    drawing a layer is one batch draw. A label is only rewritten when the
+    value behind it changes, which is the only time pyglet lays out and
+    uploads its glyphs again.
+    """
+    def __init__(self, width, height):
+        self.batch = Batch()
+        self.pause_batch = Batch()
+        self.game_over_batch = Batch()
+        self._values = {}
+        self._shown = []
+
+        # Score and stats
+        self.stats = arcade.Text("", 10, height - 30, arcade.color.WHITE, 16,
+                                 batch=self.batch)
+
+        # Active power-ups, stacked top-down in a fixed order
+        self.powerups = [
+            arcade.Text("", 10, height - 60 - i * 20, arcade.color.WHITE, 14,
+                        batch=self.batch)
+            for i in range(POWERUP_SLOTS)
+        ]
+
+        # High scores
+        self.high_score_title = arcade.Text("HIGH SCORES", width - 150, height - 30,
+                                            arcade.color.WHITE, 14, batch=self.batch)
+        self.high_scores = [
+            arcade.Text("", width - 150, height - 50 - i * 20, arcade.color.WHITE, 12,
+                        batch=self.batch)
+            for i in range(HIGH_SCORE_SLOTS)
+        ]
+
+        # Pause text
+        self.pause_labels = [
+            arcade.Text("PAUSED", width//2, height//2, arcade.color.WHITE, 40,
+                        anchor_x="center", batch=self.pause_batch),
+            arcade.Text("Press P to Resume", width//2, height//2 - 50,
+                        arcade.color.WHITE, 20, anchor_x="center", batch=self.pause_batch),
+        ]
+
+        # Game over screen
+        self.final_score = arcade.Text("", width//2, height//2, arcade.color.WHITE, 20,
+                                       anchor_x="center", batch=self.game_over_batch)
+        self.game_over_labels = [
+            arcade.Text("GAME OVER", width//2, height//2 + 50, arcade.color.RED, 40,
+                        anchor_x="center", batch=self.game_over_batch),
+            arcade.Text("Press R to Restart", width//2, height//2 - 50,
+                        arcade.color.GREEN, 20, anchor_x="center", batch=self.game_over_batch),
+            arcade.Text("Press ESC to Quit", width//2, height//2 - 80,
+                        arcade.color.RED, 16, anchor_x="center", batch=self.game_over_batch),
+        ]
+
+    def _changed(self, key, value):
+        """Remember `value` under `key`; True if it differs from last time"""
+        if self._values.get(key) == value:
+            return False
+        self._values[key] = value
+        return True
+
+    def update(self, engine, high_scores):
+        """Bring the labels in line with the game state"""
+        stats = (engine.score, engine.lives, engine.wave, engine.score_multiplier)
+        if self._changed('stats', stats):
+            self.stats.text = "Score: {}   Lives: {}   Wave: {}   x{}".format(*stats)
+
+        # The effect scheduler bumps its version when an effect starts or
+        # ends; between those only the countdowns of the shown ones move
+        effects = engine.effects
+        if self._changed('effects', effects.version):
+            self._shown = [entry for entry in POWERUP_LABELS
+                           if effects.active(entry[0])][:POWERUP_SLOTS]
+        seconds = [effects.remaining(entry[0]) // 60 for entry in self._shown]
+        if self._changed('powerups', (effects.version, seconds)):
+            for i, label in enumerate(self.powerups):
+                if i < len(self._shown):
+                    _, name, color = self._shown[i]
+                    label.text = f"{name}: {seconds[i]}s"
+                    label.color = color
+                    label.visible = True
+                else:
+                    label.visible = False
+
+        scores = tuple(high_scores[:HIGH_SCORE_SLOTS])
+        if self._changed('high_scores', scores):
+            for i, label in enumerate(self.high_scores):
+                score = scores[i] if i < len(scores) else 0
+                if score > 0:
+                    label.text = f"{i+1}. {score}"
+                    label.color = arcade.color.YELLOW if score == scores[0] else arcade.color.WHITE
+                    label.visible = True
+                else:
+                    label.visible = False
+
+    def draw(self, paused):
+        self.batch.draw()
+        if paused:
+            self.pause_batch.draw()
+
+    def draw_game_over(self, engine):
+        final = (engine.score, engine.wave)
+        if self._changed('final', final):
+            self.final_score.text = "Final Score: {}   Wave: {}".format(*final)
+        self.game_over_batch.draw()
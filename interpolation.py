@@ -0,0 +1,97 @@
+from array import array
+
+import arcade
+import numpy as np
+
+
+def _has_position_buffer():
+    """Whether SpriteList keeps the private position buffer written to here"""
+    probe = arcade.SpriteList()
+    data = getattr(probe, '_sprite_pos_angle_data', None)
+    return (isinstance(data, array) and data.typecode == 'f'
+            and isinstance(getattr(probe, '_sprite_pos_angle_changed', None), bool)
+            and isinstance(getattr(probe, 'sprite_slot', None), dict))
+
+
+# Positions are written straight into SpriteList's position buffer (4 floats
+# per slot: x, y, depth, angle), an arcade 3.3 internal. Any other layout
+# falls back to setting sprite.position one sprite at a time.
+FAST_PATH = _has_position_buffer()
+if not FAST_PATH:
+    print(f"WARNING: arcade {arcade.__version__} SpriteList has no position buffer "
+          f"layout this game knows (written for arcade 3.3); drawing via sprite.position")
+
+
+def slot_of(sprite_list, sprite):
+    """Buffer slot of a sprite in the list, or -1 without the fast path"""
+    return sprite_list.sprite_slot[sprite] if FAST_PATH else -1
+
+
+def _positions(sprite_list):
+    """Writable (slots, 2) view of a SpriteList's center positions"""
+    buffer = np.frombuffer(sprite_list._sprite_pos_angle_data, dtype=np.float32)
+    return buffer.reshape(-1, 4)[:, :2]
+
+
+def write_positions(sprite_list, slots, x, y, sprites):
+    """Set the drawn centers of the sprites in buffer `slots` in one step
+
+    The sprites' own positions are left as they were, except on the
+    fallback path, which moves `sprites` (in the same order) instead.
+    """
+    if not FAST_PATH:
+        for sprite, sx, sy in zip(sprites, x.tolist(), y.tolist()):
+            sprite.position = (sx, sy)
+        return
+    positions = _positions(sprite_list)
+    positions[slots, 0] = x
+    positions[slots, 1] = y
+    sprite_list._sprite_pos_angle_changed = True
+
+
+def _last_step(sprite):
+    """How far a sprite moved on the last tick"""
+    prev = getattr(sprite, 'prev_position', None)
+    if prev is not None:
+        x, y = sprite.position
+        return x - prev[0], y - prev[1]
+    return sprite.change_x, sprite.change_y
+
+
+def interpolate_sprites(sprite_list, alpha):
+    """Draw sprites `alpha` of the way from their previous tick to this one
+
+    Sprites that record a `prev_position` are blended towards it, the rest
+    are stepped back along their velocity. Only the SpriteList's position
+    buffer is touched; pass the result to `restore_sprites` after drawing.
+    """
+    n = len(sprite_list)
+    if n == 0 or alpha >= 1:
+        return None
+    if not FAST_PATH:
+        saved = [sprite.position for sprite in sprite_list]
+        for sprite, (x, y) in zip(sprite_list, saved):
+            dx, dy = _last_step(sprite)
+            sprite.position = (x - (1 - alpha) * dx, y - (1 - alpha) * dy)
+        return None, saved
+    slots = np.fromiter((sprite_list.sprite_slot[sprite] for sprite in sprite_list),
+                        dtype=np.int64, count=n)
+    steps = np.array([_last_step(sprite) for sprite in sprite_list], dtype=np.float32)
+    positions = _positions(sprite_list)
+    saved = positions[slots].copy()
+    positions[slots] -= (1 - alpha) * steps
+    sprite_list._sprite_pos_angle_changed = True
+    return slots, saved
+
+
+def restore_sprites(sprite_list, saved):
+    """Put back the positions replaced by `interpolate_sprites`"""
+    if saved is None:
+        return
+    slots, positions = saved
+    if slots is None:
+        for sprite, position in zip(sprite_list, positions):
+            sprite.position = position
+        return
+    _positions(sprite_list)[slots] = positions
+    sprite_list._sprite_pos_angle_changed = True
@@ -1,28 +1,53 @@
 import arcade
+import numpy as np
 import random
-import os
 import sys
-import json
-import math
-from pathlib import Path
-
-# Helper to make assets work in both normal run and PyInstaller exe
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+import time
+import argparse
+import logging
+
+from assets import Preloader, registry
+from audio import AudioMixer
+from background import Background, starfield_image
+from broadphase import UniformGrid, hit_box_extents, rect_bounds, sprite_bounds
+from bullets import BulletBatch, BulletPool
+from canvas import Canvas
+from collision import first_hits
+from effects import EffectScheduler
+from entities import EntityStore
+from formation import Formation
+from interpolation import interpolate_sprites, restore_sprites, slot_of, write_positions
+from hud import Hud
+from particles import ParticleSystem
+from pools import SpritePool
+from profiler import FrameProfiler, ProfilerOverlay
+from replay import QUIT, RESTART, Replay, ReplayRecorder, play
+from scores import ScoreStore
+from waves import load_waves
+from snapshot import (Snapshot, pack_generator_state, pack_random_state,
+                      unpack_generator_state, unpack_random_state)
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 SCREEN_TITLE = "Invader Swarm - Enhanced"
 
+# The simulation always advances in fixed ticks; every speed and timer
+# below is counted in ticks
+TICK_RATE = 60
+TICK_TIME = 1 / TICK_RATE
+# Past this many ticks in one frame the game slows down instead of
+# falling ever further behind
+MAX_TICKS_PER_FRAME = 5
+
 PLAYER_SPEED = 5
 ALIEN_SPEED_BASE = 1.2
 ALIEN_DROP_DISTANCE_BASE = 25
 BULLET_SPEED = 7
 ALIEN_BULLET_SPEED = 4
+# Ticks between alien shots: BASE on wave 1, STEP fewer each wave, never under MIN
+ALIEN_SHOOT_DELAY_BASE = 100
+ALIEN_SHOOT_DELAY_STEP = 8
+ALIEN_SHOOT_DELAY_MIN = 40
 PLAYER_BULLET_W = 5
 PLAYER_BULLET_H = 15
 ALIEN_BULLET_W = 6
@@ -37,8 +62,16 @@ TARGET_SIZES = {
     'powerup': (30, 30)
 }
 
+# Enemy types, wave layouts and bullet volleys
+WAVES = load_waves("waves.json", SCREEN_HEIGHT)
+ENEMY_TYPES = WAVES.enemy_types
+
+log = logging.getLogger("invader_swarm")
+
 # Power-up constants
 POWERUP_TYPES = ["shield", "extralife", "spread", "nuke", "rapidfire"]
+# Power-ups that run as timed effects, and their duration in ticks
+TIMED_POWERUPS = {"shield": 600, "spread": 600, "rapidfire": 600}
 POWERUP_COLORS = {
     "shield": arcade.color.BLUE,
     "extralife": arcade.color.GREEN,
@@ -47,69 +80,62 @@ POWERUP_COLORS = {
     "rapidfire": arcade.color.YELLOW
 }
 
+# Every sprite image, loaded into the asset registry before play starts
+SPRITE_ASSETS = [
+    "assets/images/player/ship.png",
+] + WAVES.images() + [f"assets/images/powerups/{power_type}.png" for power_type in POWERUP_TYPES]
+
+BACKGROUND_ASSETS = [
+    "assets/images/background/background1.png",
+    "assets/images/background/background2.png"
+]
+# Stars scrolling over the backdrop, in pixels per second
+PARALLAX_SPEED = 12
+# Largest screen shake offset, in pixels
+SCREEN_SHAKE = 5
+
+SOUND_FILES = {
+    'shoot': 'assets/sounds/shoot.mp3',
+    'explosion': 'assets/sounds/explosion.mp3',
+    'powerup': 'assets/sounds/powerup.mp3',
+    'boss': 'assets/sounds/boss.mp3',
+    'gameover': 'assets/sounds/gameover.mp3'
+}
+# (voices, cooldown seconds) per sound; cues beyond either are dropped
+SOUND_LIMITS = {
+    'shoot': (3, 0.06),
+    'explosion': (4, 0.05),
+    'powerup': (2, 0.1),
+    'boss': (1, 0.5),
+    'gameover': (1, 1.0),
+}
+MAX_VOICES = 12
+
 class SmartSprite(arcade.Sprite):
     """Sprite that auto-scales to target size"""
     def __init__(self, path, target_size, fallback_color=None, fallback_size=None):
-        try:
-            full_path = resource_path(path)
-            super().__init__(full_path)
-            # Auto-scale to target size
-            if self.width > 0 and self.height > 0:
-                scale_x = target_size[0] / self.width
-                scale_y = target_size[1] / self.height
-                self.scale = min(scale_x, scale_y)
-        except Exception as e:
-            if fallback_color and fallback_size:
-                # Create fallback texture
-                texture = arcade.make_soft_circle_texture(
-                    max(fallback_size), 
-                    fallback_color
-                )
-                super().__init__()
-                self.texture = texture
-                self.scale = fallback_size[0] / texture.width
-            else:
-                raise e
-
-class Particle:
-    def __init__(self, x, y, dx, dy, color, lifetime):
-        self.x = x
-        self.y = y
-        self.dx = dx
-        self.dy = dy
-        self.color = color
-        self.lifetime = lifetime
-        self.age = 0
-    
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        self.dy -= 0.2
-        self.age += 1
-    
-    def draw(self):
-        alpha = int(255 * (1 - self.age / self.lifetime))
-        color = (self.color[0], self.color[1], self.color[2], alpha)
-        arcade.draw_circle_filled(self.x, self.y, 2, color)
+        # Shared texture and scale from the registry, loaded only once
+        texture, scale = registry.scaled(path, target_size, fallback_color, fallback_size)
+        super().__init__(texture, scale=scale)
 
 class PowerUp(arcade.Sprite):
     def __init__(self, x, y, power_type):
-        super().__init__()
+        # Image if available, fallback to colored circle
+        texture, scale = registry.scaled(
+            f"assets/images/powerups/{power_type}.png",
+            TARGET_SIZES['powerup'],
+            POWERUP_COLORS[power_type],
+            TARGET_SIZES['powerup']
+        )
+        super().__init__(texture, scale=scale)
         self.power_type = power_type
-        # Try to load image, fallback to colored circle
-        try:
-            path = f"assets/images/powerups/{power_type}.png"
-            full_path = resource_path(path)
-            self.texture = arcade.load_texture(full_path)
-            # Auto-scale powerup
-            if self.width > 0 and self.height > 0:
-                scale = 30 / max(self.width, self.height)
-                self.scale = scale
-        except:
-            self.texture = arcade.make_soft_circle_texture(30, POWERUP_COLORS[power_type])
-        
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Start falling from (x, y); also used when a pooled power-up is reused"""
         self.center_x = x
         self.center_y = y
+        self.angle = 0
         self.change_y = -2
         self.angle_speed = 2
         
@@ -119,16 +145,15 @@ class PowerUp(arcade.Sprite):
 
 class Boss(arcade.Sprite):
     def __init__(self, wave):
-        print(f"1. Starting Boss init for wave {wave}")
+        log.debug(f"1. Starting Boss init for wave {wave}")
 
-        path = "assets/images/bosses/boss.png"
-        full_path = resource_path(path)
+        texture = registry.texture(WAVES.boss["image"])
 
         # Proper Sprite init (IMPORTANT FIX)
-        super().__init__(full_path, scale=1)
+        super().__init__(texture, scale=1)
 
 
-        print("2. Sprite parent init OK")
+        log.debug("2. Sprite parent init OK")
 
         # Scale boss
         target_size = TARGET_SIZES['boss'][0] + (wave * 5)
@@ -138,18 +163,18 @@ class Boss(arcade.Sprite):
 
         # Attributes
         self.wave = wave
-        self.health = 50 + wave * 10
+        self.health = WAVES.boss_health(wave)
         self.max_health = self.health
-        self.change_x = 2
+        self.change_x = WAVES.boss["speed"]
         self.shoot_timer = 0
-        self.shoot_delay = 30
+        self.shoot_delay = WAVES.boss["shoot_delay"]
         self.pattern = 0
 
         self.center_x = SCREEN_WIDTH // 2
         self.center_y = SCREEN_HEIGHT - 100
 
-        print("3. Boss init complete")
-        print(f"4. Boss has draw method? {hasattr(self, 'draw')}")
+        log.debug("3. Boss init complete")
+        log.debug(f"4. Boss has draw method? {hasattr(self, 'draw')}")
 
         
     def draw(self):
@@ -163,7 +188,7 @@ class Boss(arcade.Sprite):
         self.shoot_timer += 1
         if self.shoot_timer >= self.shoot_delay:
             self.shoot_timer = 0
-            self.pattern = (self.pattern + 1) % 3
+            self.pattern = (self.pattern + 1) % len(WAVES.boss_volleys)
             return True
         return False
     
@@ -190,72 +215,101 @@ class Boss(arcade.Sprite):
             arcade.color.WHITE, 2
         )
 
-class InvaderSwarm(arcade.Window):
-    def __init__(self):
-        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
-        arcade.set_background_color(arcade.color.BLACK)
-        self.game_over = False
-        self.paused = False
-        self.screen_shake = 0
-        self.high_scores = self.load_high_scores()
-        
-        # Initialize sound system for MP3
-        self.sounds = {}
-        self.load_sounds()
-        
+class SwarmEngine:
+    """Window-free game simulation.
+
+    Holds all gameplay state and advances it one fixed tick per `step`.
+    All gameplay randomness comes from a seeded RNG, so the same seed and
+    the same inputs always play out the same game. Nothing here needs a
+    GL context: `InvaderSwarm` drives it for real play, and `run_headless`
+    steps it as fast as possible for profiling.
+    """
+    # Plain attributes captured by `snapshot`
+    SNAPSHOT_COUNTERS = (
+        'screen_shake', 'score', 'lives', 'wave', 'kills', 'kills_since_powerup',
+        'alien_direction', 'shoot_cooldown', 'alien_shoot_timer', 'alien_shoot_delay',
+    )
+    SNAPSHOT_FLAGS = (
+        'game_over', 'boss_wave',
+        'left_pressed', 'right_pressed', 'up_pressed', 'down_pressed', 'fire_pressed',
+    )
+    # Every timed effect, in the order `snapshot` numbers them
+    EFFECTS = ('shield', 'spread', 'rapidfire', 'multiplier')
+
+    def __init__(self, seed=None):
+        registry.preload(SPRITE_ASSETS)
+
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.particles = ParticleSystem(rng=np.random.default_rng(seed))
+        self.player_bullets = BulletPool(BULLET_SPEED)
+        self.alien_bullets = BulletPool(-ALIEN_BULLET_SPEED)
+        self.broadphase = UniformGrid(cell_size=64)
+        self.formation = Formation()
+        self.effects = EffectScheduler()
+        # Disabled until a front end turns it on
+        self.profiler = FrameProfiler()
+
+        # Sprite lists live for the whole session and dead sprites go back
+        # to their pool, so neither is rebuilt between waves or games
+        self.aliens = arcade.SpriteList()
+        self.drifters = arcade.SpriteList()
+        self.player_list = arcade.SpriteList()
+        self.powerups = arcade.SpriteList()
+        self.boss_list = arcade.SpriteList()
+        self.alien_pool = SpritePool(self.make_alien)
+        self.drifter_pool = SpritePool(self.make_drifter)
+        self.powerup_pool = SpritePool(lambda power_type: PowerUp(0, 0, power_type))
+        # Drifter state lives in arrays; the sprites only draw it
+        self.drifter_entities = EntityStore({
+            'x': np.float64, 'y': np.float64, 'dx': np.float64, 'dy': np.float64,
+            'left': np.float64, 'bottom': np.float64, 'right': np.float64, 'top': np.float64,
+            'slot': np.int64, 'sprite': object,
+        })
+
+        # Hooks for the front end: sound_handler(name, volume) and
+        # game_over_handler(score) when the player runs out of lives
+        self.sound_handler = None
+        self.game_over_handler = None
+
         self.restart()
 
-    def load_sounds(self):
-        """Load MP3 sound files"""
-        sound_files = {
-            'shoot': 'assets/sounds/shoot.mp3',
-            'explosion': 'assets/sounds/explosion.mp3',
-            'powerup': 'assets/sounds/powerup.mp3',
-            'boss': 'assets/sounds/boss.mp3',
-            'gameover': 'assets/sounds/gameover.mp3'
-        }
-        
-        for name, file_path in sound_files.items():
-            try:
-                full_path = resource_path(file_path)
-                if os.path.exists(full_path):
-                    self.sounds[name] = arcade.load_sound(full_path)
-                    print(f"Loaded sound: {name}")
-                else:
-                    print(f"Sound file not found: {full_path}")
-            except Exception as e:
-                print(f"Could not load {name}: {e}")
+    @property
+    def shield_active(self):
+        return self.effects.active('shield')
 
-    def play_sound(self, name, volume=0.5):
-        """Play sound with error handling"""
-        if name in self.sounds and self.sounds[name]:
-            try:
-                arcade.play_sound(self.sounds[name], volume)
-            except:
-                pass
+    @property
+    def spread_shot(self):
+        return self.effects.active('spread')
 
-    def load_high_scores(self):
-        try:
-            with open('high_scores.json', 'r') as f:
-                return json.load(f)
-        except:
-            return [0, 0, 0, 0, 0]
+    @property
+    def rapid_fire(self):
+        return self.effects.active('rapidfire')
+
+    @property
+    def score_multiplier(self):
+        return self.effects.value('multiplier', 1)
 
-    def save_high_scores(self):
-        with open('high_scores.json', 'w') as f:
-            json.dump(self.high_scores, f)
+    def play_sound(self, name, volume=0.5):
+        """Forward a sound cue to the front end, if there is one"""
+        if self.sound_handler:
+            self.sound_handler(name, volume)
 
     def restart(self):
-        self.aliens = arcade.SpriteList()
-        self.drifters = arcade.SpriteList()
-        self.player_list = arcade.SpriteList()
-        self.powerups = arcade.SpriteList()
-        self.boss_list = arcade.SpriteList()
+        """Reset the simulation to the start of a new game"""
+        self.screen_shake = 0
+        self.alien_pool.release_all(self.aliens)
+        self.clear_drifters()
+        self.powerup_pool.release_all(self.powerups)
+        while self.player_list:
+            self.player_list.pop()
+        while self.boss_list:
+            self.boss_list.pop()
         self.boss = None
-        self.particles = []
+        self.particles.clear()
         
-        self.player_bullets = []
-        self.alien_bullets = []
+        self.player_bullets.clear()
+        self.alien_bullets.clear()
         
         self.score = 0
         self.lives = 3
@@ -264,19 +318,8 @@ class InvaderSwarm(arcade.Window):
         self.kills_since_powerup = 0
         self.alien_direction = 1
         
-        # Player stats
-        self.shield_active = False
-        self.shield_duration = 0
-        self.spread_shot = False
-        self.spread_duration = 0
-        self.rapid_fire = False
-        self.rapid_timer = 0
-        self.score_multiplier = 1
-        self.multiplier_timer = 0
-        
-        # Background
-        self.background = None
-        self.load_background()
+        # Power-ups and the kill-streak multiplier
+        self.effects.clear()
         
         self.setup_player()
         self.setup_aliens()
@@ -293,24 +336,167 @@ class InvaderSwarm(arcade.Window):
         self.game_over = False
         self.boss_wave = False
 
-    def load_background(self):
-        """Load random background with flexible sizing"""
-        bg_files = [
-            "assets/images/backgrounds/background1.png",
-            "assets/images/backgrounds/background2.png"
-        ]
-        bg_file = random.choice(bg_files)
-        try:
-            full_path = resource_path(bg_file)
-            if os.path.exists(full_path):
-                self.background = arcade.load_texture(full_path)
-                print(f"Loaded background: {bg_file}")
-            else:
-                print(f"Background not found: {bg_file}")
-                self.background = None
-        except Exception as e:
-            print(f"Failed to load background: {e}")
-            self.background = None
+    def snapshot(self):
+        """Capture the whole simulation state, RNGs included"""
+        snap = Snapshot()
+        snap['counters'] = np.array([getattr(self, name) for name in self.SNAPSHOT_COUNTERS],
+                                    dtype=np.int64)
+        snap['flags'] = np.array([getattr(self, name) for name in self.SNAPSHOT_FLAGS],
+                                 dtype=bool)
+        now, effects = self.effects.get_state()
+        snap['effects'] = np.array([now] + [field for name, end, value in effects
+                                            for field in (self.EFFECTS.index(name), end, value)],
+                                   dtype=np.int64)
+        snap['rng_words'], snap['rng_gauss'] = pack_random_state(self.rng)
+        snap['rng_particles'] = pack_generator_state(self.particles.rng)
+
+        player = self.player
+        prev = getattr(player, 'prev_position', None)
+        snap['player'] = np.array([player.center_x, player.center_y,
+                                   player.change_x, player.change_y, prev is not None,
+                                   *(prev or (0.0, 0.0))])
+
+        # The grid is stored as laid out; the formation state says who's alive
+        formation = self.formation
+        snap['alien_kind'] = formation.kind.copy()
+        snap['alien_home'] = np.column_stack([formation.home_x, formation.home_y]).ravel()
+        (snap['alien_alive'], snap['formation_offset'],
+         snap['formation_prev_offset'], snap['formation_motion']) = formation.get_state()
+
+        drifters = self.drifter_entities
+        snap['drifters'] = np.column_stack([drifters.view(name)
+                                            for name in ('x', 'y', 'dx', 'dy')]).ravel()
+        snap['powerup_kind'] = np.array([POWERUP_TYPES.index(p.power_type)
+                                         for p in self.powerups], dtype=np.uint8)
+        snap['powerups'] = np.array([(p.center_x, p.center_y, p.angle, p.change_y, p.angle_speed)
+                                     for p in self.powerups], dtype=np.float64).ravel()
+
+        bosses = []
+        for boss in self.boss_list:
+            prev = getattr(boss, 'prev_position', None)
+            bosses.append((boss.wave, boss.health, boss.max_health, boss.scale_x,
+                           boss.center_x, boss.center_y, boss.change_x, boss.shoot_timer,
+                           boss.shoot_delay, boss.pattern, prev is not None,
+                           *(prev or (0.0, 0.0))))
+        snap['bosses'] = np.array(bosses, dtype=np.float64).ravel()
+        snap['boss_index'] = np.array([self.boss_list.index(self.boss) if self.boss else -1],
+                                      dtype=np.int64)
+
+        for name in ('player_bullets', 'alien_bullets'):
+            for key, values in getattr(self, name).get_state().items():
+                snap[f'{name}_{key}'] = values
+
+        for name, values in self.particles.get_state().items():
+            snap['particle_' + name] = values.ravel()
+        return snap
+
+    def restore(self, snap):
+        """Return the simulation to the moment `snap` was taken"""
+        for name, value in zip(self.SNAPSHOT_COUNTERS, snap['counters'].tolist()):
+            setattr(self, name, value)
+        for name, value in zip(self.SNAPSHOT_FLAGS, snap['flags'].tolist()):
+            setattr(self, name, value)
+        now, *effects = snap['effects'].tolist()
+        self.effects.set_state(now, [(self.EFFECTS[code], end, value) for code, end, value
+                                     in zip(effects[0::3], effects[1::3], effects[2::3])])
+        unpack_random_state(self.rng, snap['rng_words'], snap['rng_gauss'])
+        unpack_generator_state(self.particles.rng, snap['rng_particles'])
+
+        x, y, change_x, change_y, has_prev, prev_x, prev_y = snap['player'].tolist()
+        player = self.player
+        player.position = (x, y)
+        player.change_x = change_x
+        player.change_y = change_y
+        player.prev_position = (prev_x, prev_y) if has_prev else player.position
+
+        formation = self.formation
+        kinds = snap['alien_kind']
+        home = snap['alien_home'].reshape(-1, 2)
+        alive = snap['alien_alive']
+        same_grid = (len(kinds) == len(formation.sprites)
+                     and np.array_equal(home[:, 0], formation.home_x)
+                     and np.array_equal(home[:, 1], formation.home_y)
+                     and np.array_equal(kinds, formation.kind))
+        if same_grid:
+            # Same wave layout (e.g. a rollback): only the aliens whose fate
+            # differs change, retired ones back to the pool, revived ones out
+            # of it and into their place in list order
+            changed = np.flatnonzero(alive != formation.alive).tolist()
+            position = np.cumsum(alive) - alive
+            for i in changed:
+                alien = formation.sprites[i]
+                if alive[i]:
+                    self.alien_pool.reclaim(alien)
+                    self.aliens.insert(int(position[i]), alien)
+                else:
+                    self.aliens.remove(alien)
+                    self.alien_pool.release(alien)
+            formation.set_state(alive, snap['formation_offset'],
+                                snap['formation_prev_offset'], snap['formation_motion'])
+            if changed:
+                formation.relink(self.aliens)
+        else:
+            # Rebuild the grid as laid out, then drop the aliens that were dead
+            self.alien_pool.release_all(self.aliens)
+            for kind, position in zip(kinds.tolist(), home.tolist()):
+                alien = self.alien_pool.acquire(ENEMY_TYPES[kind])
+                alien.position = position
+                self.aliens.append(alien)
+            formation.reset(self.aliens, kinds, WAVES.kind_speed[kinds])
+            formation.set_state(alive, snap['formation_offset'],
+                                snap['formation_prev_offset'], snap['formation_motion'])
+            for i in np.flatnonzero(~alive).tolist():
+                alien = formation.sprites[i]
+                self.aliens.remove(alien)
+                self.alien_pool.release(alien)
+        formation.apply(self.aliens)
+
+        self.clear_drifters()
+        for x, y, dx, dy in snap['drifters'].reshape(-1, 4).tolist():
+            self.add_drifter(x, y, dx, dy)
+
+        self.powerup_pool.release_all(self.powerups)
+        kinds = snap['powerup_kind'].tolist()
+        for kind, (x, y, angle, change_y, angle_speed) in zip(
+                kinds, snap['powerups'].reshape(-1, 5).tolist()):
+            powerup = self.powerup_pool.acquire(POWERUP_TYPES[kind])
+            powerup.reset(x, y)
+            powerup.angle = angle
+            powerup.change_y = change_y
+            powerup.angle_speed = angle_speed
+            self.powerups.append(powerup)
+
+        # Bosses are rare, so existing ones are reused and others rebuilt
+        old_bosses = list(self.boss_list)
+        while self.boss_list:
+            self.boss_list.pop()
+        for i, state in enumerate(snap['bosses'].reshape(-1, 13).tolist()):
+            (wave, health, max_health, scale, x, y, change_x, shoot_timer,
+             shoot_delay, pattern, has_prev, prev_x, prev_y) = state
+            boss = old_bosses[i] if i < len(old_bosses) else Boss(int(wave))
+            boss.wave = int(wave)
+            boss.health = int(health)
+            boss.max_health = int(max_health)
+            boss.scale = scale
+            boss.position = (x, y)
+            boss.change_x = change_x
+            boss.shoot_timer = int(shoot_timer)
+            boss.shoot_delay = int(shoot_delay)
+            boss.pattern = int(pattern)
+            boss.prev_position = (prev_x, prev_y) if has_prev else boss.position
+            self.boss_list.append(boss)
+        boss_index = int(snap['boss_index'][0])
+        self.boss = self.boss_list[boss_index] if boss_index >= 0 else None
+
+        for name in ('player_bullets', 'alien_bullets'):
+            pool = getattr(self, name)
+            pool.set_state({key: snap.arrays[f'{name}_{key}'] for key in pool.get_state()
+                            if f'{name}_{key}' in snap.arrays})
+
+        state = {name[len('particle_'):]: values for name, values in snap.arrays.items()
+                 if name.startswith('particle_')}
+        state['color'] = state['color'].reshape(-1, 3)
+        self.particles.set_state(state)
 
     def setup_player(self):
         """Setup player with auto-scaling"""
@@ -321,9 +507,9 @@ class InvaderSwarm(arcade.Window):
                 arcade.color.CYAN,
                 TARGET_SIZES['player']
             )
-            print("Player loaded and scaled")
+            log.info("Player loaded and scaled")
         except Exception as e:
-            print(f"Failed to load ship.png: {e}")
+            log.warning(f"Failed to load ship.png: {e}")
             self.player = arcade.SpriteSolidColor(
                 TARGET_SIZES['player'][0],
                 TARGET_SIZES['player'][1],
@@ -336,341 +522,271 @@ class InvaderSwarm(arcade.Window):
 
     def setup_aliens(self):
         """Setup aliens with flexible sizing"""
-        self.aliens = arcade.SpriteList()
-        self.drifters = arcade.SpriteList()
+        self.alien_pool.release_all(self.aliens)
+        self.clear_drifters()
         
-        # Boss wave every 5 waves
-        if self.wave % 5 == 0:
+        if WAVES.is_boss_wave(self.wave):
             boss = Boss(self.wave)
             self.boss_list.append(boss)
             self.boss = boss
             self.boss_wave = True
+            self.formation.reset(self.aliens)
             self.play_sound('boss', 0.3)
             return
         
         self.boss_wave = False
         self.boss = None
         
-        # Progressive difficulty
-        rows = min(5, 3 + self.wave // 2)
-        cols = min(11, 8 + self.wave // 3)
-        
-        enemy_types = ["green", "red", "extra", "alien"]
-        for row in range(rows):
-            enemy_type = enemy_types[row % len(enemy_types)]
-            for col in range(cols):
-                try:
-                    # Try to load specific enemy sprite
-                    path = f"assets/images/enemies/{enemy_type}.png"
-                    alien = SmartSprite(
-                        path,
-                        TARGET_SIZES['enemy'],
-                        arcade.color.LIME,
-                        TARGET_SIZES['enemy']
-                    )
-                except:
-                    # Fallback to colored rectangle
-                    alien = arcade.SpriteSolidColor(
-                        TARGET_SIZES['enemy'][0],
-                        TARGET_SIZES['enemy'][1],
-                        arcade.color.LIME
-                    )
-
-                alien.alien_type = enemy_type
-                alien.center_x = 40 + col * 65
-                alien.center_y = SCREEN_HEIGHT - 80 - row * 35
-                
-                # Different speeds for different alien types
-                if alien.alien_type == "red":
-                    alien.change_x_mult = 1.2
-                elif alien.alien_type == "extra":
-                    alien.change_x_mult = 0.8
-                else:
-                    alien.change_x_mult = 1.0
-                    
-                self.aliens.append(alien)
+        # Layouts grow with the wave number, see waves.json
+        self.spawn_grid(*WAVES.layout(self.wave))
+
+    def spawn_grid(self, kinds, xs, ys):
+        """Replace the alien grid with enemies of `kinds` at (xs, ys)"""
+        self.alien_pool.release_all(self.aliens)
+        for kind, x, y in zip(kinds.tolist(), xs.tolist(), ys.tolist()):
+            alien = self.alien_pool.acquire(ENEMY_TYPES[kind])
+            alien.position = (x, y)
+            self.aliens.append(alien)
+        self.formation.reset(self.aliens, kinds, WAVES.kind_speed[kinds])
+
+    def make_alien(self, enemy_type):
+        """Build a grid alien for the pool"""
+        try:
+            # Try to load specific enemy sprite
+            alien = SmartSprite(
+                WAVES.enemy(enemy_type)["image"],
+                TARGET_SIZES['enemy'],
+                arcade.color.LIME,
+                TARGET_SIZES['enemy']
+            )
+        except:
+            # Fallback to colored rectangle
+            alien = arcade.SpriteSolidColor(
+                TARGET_SIZES['enemy'][0],
+                TARGET_SIZES['enemy'][1],
+                arcade.color.LIME
+            )
+
+        return alien
+
+    def make_drifter(self, kind):
+        """Build a drifter for the pool"""
+        try:
+            drifter = SmartSprite(
+                "assets/images/enemies/alien.png",
+                TARGET_SIZES['drifter'],
+                arcade.color.MAGENTA,
+                TARGET_SIZES['drifter']
+            )
+        except:
+            drifter = arcade.SpriteSolidColor(
+                TARGET_SIZES['drifter'][0],
+                TARGET_SIZES['drifter'][1],
+                arcade.color.MAGENTA
+            )
+        return drifter
 
     def create_explosion(self, x, y, color=arcade.color.ORANGE):
         """Create particle explosion effect"""
-        for _ in range(20):
-            dx = random.uniform(-3, 3)
-            dy = random.uniform(-3, 3)
-            self.particles.append(Particle(x, y, dx, dy, color, 30))
+        self.particles.emit(x, y, color, count=20, speed=3, lifetime=30)
 
     def spawn_powerup(self, x, y):
         """Spawn random power-up"""
-        if random.random() < 0.2:
-            power_type = random.choice(POWERUP_TYPES)
-            self.powerups.append(PowerUp(x, y, power_type))
+        if self.rng.random() < 0.2:
+            power_type = self.rng.choice(POWERUP_TYPES)
+            powerup = self.powerup_pool.acquire(power_type)
+            powerup.reset(x, y)
+            self.powerups.append(powerup)
 
     def shoot(self):
         """Player shooting with spread shot support"""
         if self.spread_shot:
             # Spread shot - 3 bullets
-            self.player_bullets.append([self.player.center_x, self.player.center_y + 20])
-            self.player_bullets.append([self.player.center_x - 15, self.player.center_y + 20])
-            self.player_bullets.append([self.player.center_x + 15, self.player.center_y + 20])
+            self.player_bullets.spawn(self.player.center_x, self.player.center_y + 20)
+            self.player_bullets.spawn(self.player.center_x - 15, self.player.center_y + 20)
+            self.player_bullets.spawn(self.player.center_x + 15, self.player.center_y + 20)
         else:
-            self.player_bullets.append([self.player.center_x, self.player.center_y + 20])
+            self.player_bullets.spawn(self.player.center_x, self.player.center_y + 20)
         self.play_sound('shoot', 0.2)
 
     def shoot_alien(self):
         """Alien shooting with patterns"""
         if not self.aliens or self.boss_wave:
             return
-        shooter = random.choice(self.aliens)
+        i = int(self.rng.choice(self.formation.live_indices()))
+        shooter = self.formation.sync(i)
         
-        if shooter.alien_type == "red":
-            # Red aliens shoot faster in bursts
-            for offset in [-10, 0, 10]:
-                self.alien_bullets.append([shooter.center_x + offset, shooter.center_y - 15])
-        else:
-            self.alien_bullets.append([shooter.center_x, shooter.center_y - 15])
-
-    def handle_alien_death(self, alien):
-        """Handle alien destruction with rewards"""
-        # First check if the alien is still in the list
-        if alien not in self.aliens:
+        muzzle_x, muzzle_y = WAVES.muzzle
+        WAVES.kinds[self.formation.kind[i]]["volley"].fire(
+            self.alien_bullets, shooter.center_x + muzzle_x, shooter.center_y + muzzle_y)
+
+    def handle_alien_death(self, i):
+        """Handle destruction of formation alien `i` with rewards"""
+        # It may have died already this tick
+        formation = self.formation
+        if not formation.alive[i]:
             return
-            
+        alien = formation.sync(i)
+
         self.create_explosion(alien.center_x, alien.center_y)
         self.play_sound('explosion', 0.3)
         
         # Store alien properties before removal
-        alien_type = alien.alien_type
+        enemy = WAVES.kinds[formation.kind[i]]
         alien_x = alien.center_x
         alien_y = alien.center_y
         
-        # Remove the alien
-        self.aliens.remove(alien)
+        # Hide the alien; its sprite is pooled at the end of the tick
+        alien.visible = False
+        formation.kill(i)
         
-        if alien_type == "extra":
-            self.score += 50 * self.wave * self.score_multiplier
-            self.spawn_powerup(alien_x, alien_y)
-            
-        elif alien_type == "alien":
+        # Rewards come from the enemy type; a sure drop doesn't roll the RNG
+        if enemy["bonus"]:
+            self.score += enemy["bonus"] * self.wave * self.score_multiplier
+        chance = enemy["powerup_chance"]
+        if chance >= 1 or (chance > 0 and self.rng.random() < chance):
             self.spawn_powerup(alien_x, alien_y)
-            # Create 2 drifters
-            for _ in range(2):
-                try:
-                    drifter = SmartSprite(
-                        "assets/images/enemies/alien.png",
-                        TARGET_SIZES['drifter'],
-                        arcade.color.MAGENTA,
-                        TARGET_SIZES['drifter']
-                    )
-                except:
-                    drifter = arcade.SpriteSolidColor(
-                        TARGET_SIZES['drifter'][0],
-                        TARGET_SIZES['drifter'][1],
-                        arcade.color.MAGENTA
-                    )
-                
-                drifter.alien_type = "drifter"
-                drifter.center_x = alien_x + random.uniform(-20, 20)
-                drifter.center_y = alien_y + random.uniform(-10, 10)
-                drifter.change_x = random.uniform(-1.5, 1.5)
-                drifter.change_y = random.uniform(-1.0, -0.5)
-                drifter.is_drifter = True
-                self.drifters.append(drifter)
-                
-        elif alien_type in ["green", "red"]:
-            if random.random() < 0.1:
-                self.spawn_powerup(alien_x, alien_y)
-
-    def handle_drifter_death(self, drifter):
+        for _ in range(enemy["drifters"]):
+            self.spawn_drifter(alien_x, alien_y)
+
+    def spawn_drifter(self, x, y):
+        """Release a small drifter near (x, y)"""
+        x = x + self.rng.uniform(-20, 20)
+        y = y + self.rng.uniform(-10, 10)
+        dx = self.rng.uniform(-1.5, 1.5)
+        dy = self.rng.uniform(-1.0, -0.5)
+        return self.add_drifter(x, y, dx, dy)
+
+    def add_drifter(self, x, y, dx, dy):
+        """Put a pooled drifter sprite on screen; returns its entity id"""
+        drifter = self.drifter_pool.acquire("drifter")
+        drifter.position = (x, y)
+        # Only read by render interpolation
+        drifter.change_x = dx
+        drifter.change_y = dy
+        self.drifters.append(drifter)
+        left, bottom, right, top = hit_box_extents(drifter)
+        return self.drifter_entities.spawn(
+            x=x, y=y, dx=dx, dy=dy, left=left, bottom=bottom, right=right, top=top,
+            slot=slot_of(self.drifters, drifter), sprite=drifter)
+
+    def remove_drifter(self, row):
+        """Flag a drifter dead and hide it; the store sweeps it later"""
+        entities = self.drifter_entities
+        entities.kill(row)
+        entities.sprite[row].visible = False
+
+    def clear_drifters(self):
+        self.drifter_pool.release_all(self.drifters)
+        self.drifter_entities.clear()
+
+    def move_drifters(self):
+        """Move every drifter along its velocity and update the sprite buffer"""
+        entities = self.drifter_entities
+        n = entities.count
+        if not n:
+            return
+        entities.x[:n] += entities.dx[:n]
+        entities.y[:n] += entities.dy[:n]
+        write_positions(self.drifters, entities.slot[:n], entities.x[:n], entities.y[:n],
+                        entities.sprite[:n])
+
+    def drifter_bounds(self):
+        """(left, bottom, right, top) hit-box arrays of the drifters, in row order"""
+        entities = self.drifter_entities
+        x = entities.view('x')
+        y = entities.view('y')
+        return (x + entities.view('left'), y + entities.view('bottom'),
+                x + entities.view('right'), y + entities.view('top'))
+
+    def sync_drifter(self, row):
+        """Bring a drifter sprite's own position up to date and return it"""
+        entities = self.drifter_entities
+        drifter = entities.sprite[row]
+        drifter.position = (float(entities.x[row]), float(entities.y[row]))
+        return drifter
+
+    def handle_drifter_death(self, entity):
         """Handle drifter destruction"""
-        if drifter not in self.drifters:
+        entities = self.drifter_entities
+        row = entities.row(entity)
+        if row is None:
             return
             
         self.score += 5 * self.wave * self.score_multiplier
-        self.create_explosion(drifter.center_x, drifter.center_y, arcade.color.PURPLE)
-        self.drifters.remove(drifter)
+        self.create_explosion(float(entities.x[row]), float(entities.y[row]), arcade.color.PURPLE)
+        self.remove_drifter(row)
 
     def activate_powerup(self, powerup):
         """Activate power-up effects"""
         self.play_sound('powerup', 0.4)
         power_type = powerup.power_type
         
-        if power_type == "shield":
-            self.shield_active = True
-            self.shield_duration = 600
+        if power_type in TIMED_POWERUPS:
+            self.effects.activate(power_type, TIMED_POWERUPS[power_type])
         elif power_type == "extralife":
             self.lives += 1
-        elif power_type == "spread":
-            self.spread_shot = True
-            self.spread_duration = 600
         elif power_type == "nuke":
-            # Destroy all enemies
-            for alien in self.aliens:
-                self.create_explosion(alien.center_x, alien.center_y)
-            self.aliens = arcade.SpriteList()
-            for drifter in self.drifters:
-                self.create_explosion(drifter.center_x, drifter.center_y)
-            self.drifters = arcade.SpriteList()
-            self.score += 100 * self.wave * self.score_multiplier
-        elif power_type == "rapidfire":
-            self.rapid_fire = True
-            self.rapid_timer = 600
+            self.nuke()
         
         if powerup in self.powerups:
             self.powerups.remove(powerup)
-
-    def rect_collides_sprite(self, rect_cx, rect_cy, rect_w, rect_h, sprite):
-        """Rectangle-sprite collision detection"""
-        left = rect_cx - rect_w / 2
-        right = rect_cx + rect_w / 2
-        bottom = rect_cy - rect_h / 2
-        top = rect_cy + rect_h / 2
-        return (left < sprite.right and right > sprite.left and
-                bottom < sprite.top and top > sprite.bottom)
-
-    def on_draw(self):
-        """Render the game"""
-        # Screen shake effect
-        if self.screen_shake > 0:
-            shake_x = random.randint(-5, 5)
-            shake_y = random.randint(-5, 5)
-            self.screen_shake -= 1
-        else:
-            shake_x = shake_y = 0
-            
-        self.clear()
-
-        # Draw background (stretched to fit screen)
-        if self.background:
-            arcade.draw_texture_rect(
-                self.background,
-                arcade.XYWH(shake_x, shake_y, SCREEN_WIDTH, SCREEN_HEIGHT)
-            )
-
-        # Draw game objects
-        self.aliens.draw()
-        self.drifters.draw()
-        self.powerups.draw()
-        self.player_list.draw()
-        
-        if self.boss_list:
-            self.boss_list.draw()
-            for boss in self.boss_list:
-                boss.draw_health_bar()
-
-        # Draw bullets
-        for bx, by in self.player_bullets:
-            arcade.draw_lrbt_rectangle_filled(
-                bx - PLAYER_BULLET_W/2,
-                bx + PLAYER_BULLET_W/2,
-                by - PLAYER_BULLET_H/2,
-                by + PLAYER_BULLET_H/2,
-                arcade.color.WHITE_SMOKE
-            )
-
-        for bx, by in self.alien_bullets:
-            arcade.draw_lrbt_rectangle_filled(
-                bx - ALIEN_BULLET_W/2,
-                bx + ALIEN_BULLET_W/2,
-                by - ALIEN_BULLET_H/2,
-                by + ALIEN_BULLET_H/2,
-                arcade.color.RED
-            )
-
-        # Draw particles
-        for particle in self.particles:
-            particle.draw()
-
-        # Draw shield effect
-        if self.shield_active:
-            arcade.draw_circle_outline(
-                self.player.center_x, self.player.center_y,
-                35, arcade.color.BLUE, 2
-            )
-
-        # Draw UI
-        self.draw_ui()
-        
-        # Game over screen
+            self.powerup_pool.release(powerup)
+
+    def bump_multiplier(self):
+        """Raise the score multiplier with the kill streak for the next 3 seconds"""
+        self.effects.activate('multiplier', 180, min(4, 1 + self.kills_since_powerup // 10))
+
+    def nuke(self):
+        """Destroy all enemies"""
+        formation = self.formation
+        for i in formation.live_indices().tolist():
+            alien = formation.sync(i)
+            self.create_explosion(alien.center_x, alien.center_y)
+        self.alien_pool.release_all(self.aliens)
+        self.formation.reset(self.aliens)
+        entities = self.drifter_entities
+        for x, y in zip(entities.view('x').tolist(), entities.view('y').tolist()):
+            self.create_explosion(x, y)
+        self.clear_drifters()
+        self.score += 100 * self.wave * self.score_multiplier
+
+    def bullet_hits(self, bullets, bullet_w, bullet_h, target_rects):
+        """(bullet, target) index arrays, at most one hit per active bullet"""
+        n = len(bullets)
+        bullet_rects = rect_bounds(bullets.x[:n], bullets.y[:n], bullet_w, bullet_h)
+
+        # Broadphase narrows the candidates, the kernel tests them all at once
+        self.broadphase.build(*target_rects)
+        bullet_idx, target_idx = self.broadphase.query(*bullet_rects)
+        live = bullets.active[bullet_idx]
+        return first_hits(bullet_rects, target_rects, (bullet_idx[live], target_idx[live]))
+
+    def step(self):
+        """Advance the simulation by one tick"""
         if self.game_over:
-            self.draw_game_over()
-
-    def draw_ui(self):
-        """Draw user interface"""
-        # Score and stats
-        arcade.draw_text(
-            f"Score: {self.score}   Lives: {self.lives}   Wave: {self.wave}   x{self.score_multiplier}",
-            10, SCREEN_HEIGHT - 30,
-            arcade.color.WHITE, 16
-        )
-
-        # Active power-ups
-        y_offset = SCREEN_HEIGHT - 60
-        if self.rapid_fire:
-            arcade.draw_text(f"RAPID FIRE: {self.rapid_timer//60}s",
-                           10, y_offset, arcade.color.YELLOW, 14)
-            y_offset -= 20
-        if self.spread_shot:
-            arcade.draw_text(f"SPREAD SHOT: {self.spread_duration//60}s",
-                           10, y_offset, arcade.color.ORANGE, 14)
-            y_offset -= 20
-        if self.shield_active:
-            arcade.draw_text(f"SHIELD: {self.shield_duration//60}s",
-                           10, y_offset, arcade.color.BLUE, 14)
-
-        # High scores
-        arcade.draw_text("HIGH SCORES", SCREEN_WIDTH - 150, SCREEN_HEIGHT - 30,
-                       arcade.color.WHITE, 14)
-        for i, score in enumerate(self.high_scores[:5]):
-            if score > 0:
-                color = arcade.color.YELLOW if score == self.high_scores[0] else arcade.color.WHITE
-                arcade.draw_text(f"{i+1}. {score}", SCREEN_WIDTH - 150,
-                               SCREEN_HEIGHT - 50 - i * 20, color, 12)
-
-        # Pause text
-        if self.paused:
-            arcade.draw_text("PAUSED", SCREEN_WIDTH//2, SCREEN_HEIGHT//2,
-                           arcade.color.WHITE, 40, anchor_x="center")
-            arcade.draw_text("Press P to Resume", SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50,
-                           arcade.color.WHITE, 20, anchor_x="center")
-
-    def draw_game_over(self):
-        """Draw game over screen"""
-        # Draw semi-transparent overlay
-        arcade.draw_lrbt_rectangle_filled(
-            0, SCREEN_WIDTH, 0, SCREEN_HEIGHT,
-            (0, 0, 0, 200)
-        )
-        arcade.draw_text("GAME OVER", SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50,
-                       arcade.color.RED, 40, anchor_x="center")
-        arcade.draw_text(f"Final Score: {self.score}   Wave: {self.wave}",
-                       SCREEN_WIDTH//2, SCREEN_HEIGHT//2,
-                       arcade.color.WHITE, 20, anchor_x="center")
-        arcade.draw_text("Press R to Restart",
-                       SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50,
-                       arcade.color.GREEN, 20, anchor_x="center")
-        arcade.draw_text("Press ESC to Quit",
-                       SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80,
-                       arcade.color.RED, 16, anchor_x="center")
-
-    def on_update(self, delta_time):
-        """Update game logic"""
-        if self.game_over or self.paused:
             return
+        prof = self.profiler
+        prof.start('update')
 
         # Update screen shake
         if self.screen_shake > 0:
             self.screen_shake -= 1
 
         # Update particles
-        self.particles = [p for p in self.particles if p.age < p.lifetime]
-        for particle in self.particles:
-            particle.update()
+        self.particles.update()
+        prof.lap('particles')
 
         # Update power-ups
         self.powerups.update()
         for powerup in self.powerups:
             if powerup.center_y < 0:
                 self.powerups.remove(powerup)
+                self.powerup_pool.release(powerup)
+        prof.lap('powerups')
 
         # Player movement
+        self.player.prev_position = self.player.position
         self.player.change_x = 0
         self.player.change_y = 0
         if self.left_pressed: 
@@ -693,105 +809,76 @@ class InvaderSwarm(arcade.Window):
             self.shoot_cooldown = 8 if self.rapid_fire else 25
         self.shoot_cooldown = max(0, self.shoot_cooldown - 1)
 
-        # Power-up timers
-        if self.rapid_fire:
-            self.rapid_timer -= 1
-            if self.rapid_timer <= 0:
-                self.rapid_fire = False
-        
-        if self.spread_shot:
-            self.spread_duration -= 1
-            if self.spread_duration <= 0:
-                self.spread_shot = False
-        
-        if self.shield_active:
-            self.shield_duration -= 1
-            if self.shield_duration <= 0:
-                self.shield_active = False
-
-        # Score multiplier
-        if self.multiplier_timer > 0:
-            self.multiplier_timer -= 1
-            if self.multiplier_timer <= 0:
-                self.score_multiplier = 1
+        # Power-ups and the score multiplier run out
+        self.effects.advance()
+        prof.lap('player')
 
         # Boss battle
         if self.boss:
             self.update_boss()
+        prof.lap('boss')
 
         # Regular alien movement
         if not self.boss_wave:
             self.update_aliens()
+        prof.lap('aliens')
 
         # Move bullets
-        for bullet in self.player_bullets[:]:
-            bullet[1] += BULLET_SPEED
-        
-        for bullet in self.alien_bullets[:]:
-            bullet[1] -= ALIEN_BULLET_SPEED
+        self.player_bullets.move()
+        self.alien_bullets.move()
+        prof.lap('bullets')
 
         # Handle collisions
         self.handle_collisions()
+        prof.lap('handle_collisions')
 
         # Check wave completion
         self.check_wave_completion()
+        prof.lap('check_wave_completion')
 
         # Remove off-screen objects
         self.cleanup_offscreen()
+        prof.lap('cleanup_offscreen')
+
+        # Pool the sprites of everything that died this tick
+        self.sweep_sprites()
+        prof.lap('sweep_sprites')
 
         # Check game over
         if self.lives <= 0:
             self.game_over = True
             self.play_sound('gameover', 0.5)
-            # Update high scores
-            self.high_scores.append(self.score)
-            self.high_scores.sort(reverse=True)
-            self.high_scores = self.high_scores[:5]
-            self.save_high_scores()
+            if self.game_over_handler:
+                self.game_over_handler(self.score)
+        prof.stop()
 
     def update_boss(self):
         """Update boss logic"""
+        self.boss.prev_position = self.boss.position
         if self.boss.update():
-            # Boss shooting patterns
-            if self.boss.pattern == 0:
-                # Single shot
-                self.alien_bullets.append([self.boss.center_x, self.boss.center_y - 30])
-            elif self.boss.pattern == 1:
-                # Spread shot
-                for angle in range(-45, 46, 15):
-                    rad = math.radians(angle)
-                    bullet = [self.boss.center_x + math.sin(rad) * 30, 
-                             self.boss.center_y - 30 + math.cos(rad) * 10]
-                    self.alien_bullets.append(bullet)
-            elif self.boss.pattern == 2:
-                # Triple shot
-                for offset in [-20, 0, 20]:
-                    self.alien_bullets.append([self.boss.center_x + offset, 
-                                              self.boss.center_y - 30])
+            # Boss volleys cycle through the list in waves.json
+            muzzle_x, muzzle_y = WAVES.boss_muzzle
+            WAVES.boss_volleys[self.boss.pattern].fire(
+                self.alien_bullets, self.boss.center_x + muzzle_x, self.boss.center_y + muzzle_y)
 
     def update_aliens(self):
         """Update regular alien movement"""
-        self.aliens.update()
-        self.drifters.update()
+        self.move_drifters()
 
-        edge_hit = False
         current_speed = ALIEN_SPEED_BASE + (self.wave - 1) * 0.3
-        
-        for alien in self.aliens:
-            alien.change_x = current_speed * self.alien_direction * getattr(alien, 'change_x_mult', 1.0)
-            if (self.alien_direction > 0 and alien.right >= SCREEN_WIDTH) or \
-               (self.alien_direction < 0 and alien.left <= 0):
-                edge_hit = True
+        edge_hit = self.formation.advance(current_speed, self.alien_direction, SCREEN_WIDTH)
 
         if edge_hit:
             self.alien_direction *= -1
             drop_dist = ALIEN_DROP_DISTANCE_BASE + (self.wave - 1) * 2
-            for alien in self.aliens:
-                alien.center_y -= drop_dist
+            self.formation.descend(drop_dist)
+
+        self.formation.apply(self.aliens)
 
         # Alien shooting
         if self.aliens:
-            self.alien_shoot_delay = max(40, 100 - (self.wave - 1) * 8)
+            self.alien_shoot_delay = max(ALIEN_SHOOT_DELAY_MIN, ALIEN_SHOOT_DELAY_BASE
+                                         - (self.wave - 1) * ALIEN_SHOOT_DELAY_STEP)
             self.alien_shoot_timer += 1
             if self.alien_shoot_timer >= self.alien_shoot_delay:
                 self.shoot_alien()
@@ -800,62 +887,45 @@ class InvaderSwarm(arcade.Window):
     def handle_collisions(self):
         """Handle all collision detection"""
         # Player bullets vs enemies
-        bullets_to_remove = set()
-        aliens_to_remove = set()
-        drifters_to_remove = set()
-        
-        for bullet in self.player_bullets[:]:
-            bullet_removed = False
-            
-            # Check aliens
-            for alien in self.aliens:
-                if self.rect_collides_sprite(bullet[0], bullet[1],
-                                            PLAYER_BULLET_W, PLAYER_BULLET_H, alien):
-                    bullets_to_remove.add(tuple(bullet))
-                    aliens_to_remove.add(alien)
-                    bullet_removed = True
-                    break
-            
-            # Check drifters if bullet wasn't removed
-            if not bullet_removed:
-                for drifter in self.drifters:
-                    if self.rect_collides_sprite(bullet[0], bullet[1],
-                                                PLAYER_BULLET_W, PLAYER_BULLET_H, drifter):
-                        bullets_to_remove.add(tuple(bullet))
-                        drifters_to_remove.add(drifter)
-                        break
+        bullets = self.player_bullets
+
+        # Check aliens
+        live = self.formation.live_indices()
+        hit_bullets, hit_aliens = self.bullet_hits(bullets, PLAYER_BULLET_W, PLAYER_BULLET_H,
+                                                   self.formation.bounds())
+        bullets.kill(hit_bullets)
+        aliens_to_remove = dict.fromkeys(live[hit_aliens].tolist())
+
+        # Check drifters with bullets that didn't hit an alien
+        entities = self.drifter_entities
+        hit_bullets, hit_drifters = self.bullet_hits(bullets, PLAYER_BULLET_W, PLAYER_BULLET_H,
+                                                     self.drifter_bounds())
+        bullets.kill(hit_bullets)
+        drifters_to_remove = dict.fromkeys(entities.id[hit_drifters].tolist())
 
         # Process hits
-        for bullet in bullets_to_remove:
-            bullet_list = [b for b in self.player_bullets if tuple(b) == bullet]
-            for b in bullet_list:
-                if b in self.player_bullets:
-                    self.player_bullets.remove(b)
+        bullets.sweep()
         
-        for alien in aliens_to_remove:
-            self.handle_alien_death(alien)
+        for i in aliens_to_remove:
+            self.handle_alien_death(i)
             self.kills += 1
             self.kills_since_powerup += 1
             self.score += 10 * self.wave * self.score_multiplier
             
-            # Update score multiplier
-            self.score_multiplier = min(4, 1 + self.kills_since_powerup // 10)
-            self.multiplier_timer = 180
+            self.bump_multiplier()
             
             # Rapid fire power-up
             if self.kills % 20 == 0:
-                self.rapid_fire = True
-                self.rapid_timer = 300
+                self.effects.activate('rapidfire', 300)
         
-        for drifter in drifters_to_remove:
-            self.handle_drifter_death(drifter)
+        for entity in drifters_to_remove:
+            self.handle_drifter_death(entity)
             self.kills += 1
             self.kills_since_powerup += 1
             self.score += 10 * self.wave * self.score_multiplier
             
-            # Update score multiplier
-            self.score_multiplier = min(4, 1 + self.kills_since_powerup // 10)
-            self.multiplier_timer = 180
+            self.bump_multiplier()
+        entities.sweep()
 
         # Power-up collisions
         for powerup in self.powerups:
@@ -864,66 +934,68 @@ class InvaderSwarm(arcade.Window):
                 break
 
         # Enemy bullets vs player
-        for bullet in self.alien_bullets[:]:
-            if self.rect_collides_sprite(bullet[0], bullet[1],
-                                        ALIEN_BULLET_W, ALIEN_BULLET_H, self.player):
-                if bullet in self.alien_bullets:
-                    self.alien_bullets.remove(bullet)
-                if not self.shield_active:
-                    self.lives -= 1
-                    self.screen_shake = 10
-                    self.create_explosion(self.player.center_x, self.player.center_y, arcade.color.RED)
-                    self.play_sound('explosion', 0.3)
-                else:
-                    self.create_explosion(bullet[0], bullet[1], arcade.color.BLUE)
-                break
+        hit_bullets, _ = self.bullet_hits(self.alien_bullets, ALIEN_BULLET_W, ALIEN_BULLET_H,
+                                          sprite_bounds([self.player]))
+        if len(hit_bullets):
+            i = int(hit_bullets[0])
+            bx, by = self.alien_bullets.x[i], self.alien_bullets.y[i]
+            self.alien_bullets.remove(i)
+            if not self.shield_active:
+                self.lives -= 1
+                self.screen_shake = 10
+                self.create_explosion(self.player.center_x, self.player.center_y, arcade.color.RED)
+                self.play_sound('explosion', 0.3)
+            else:
+                self.create_explosion(bx, by, arcade.color.BLUE)
 
         # Player collision with enemies
         if not self.shield_active:
-            hit_list = arcade.check_for_collision_with_list(self.player, self.aliens)
-            for alien in hit_list:
-                if alien in self.aliens:
-                    self.handle_alien_death(alien)
+            # Formation bounds pick the candidates, hit boxes decide
+            live = self.formation.live_indices()
+            touching, _ = first_hits(self.formation.bounds(), sprite_bounds([self.player]))
+            for k in live[touching].tolist():
+                alien = self.formation.sync(k)
+                if arcade.check_for_collision(self.player, alien):
+                    self.handle_alien_death(k)
                     self.lives -= 1
                     self.screen_shake = 10
                 
-            drifter_hit_list = arcade.check_for_collision_with_list(self.player, self.drifters)
-            for drifter in drifter_hit_list:
-                if drifter in self.drifters:
-                    self.handle_drifter_death(drifter)
+            touching, _ = first_hits(self.drifter_bounds(), sprite_bounds([self.player]))
+            for row in touching.tolist():
+                if arcade.check_for_collision(self.player, self.sync_drifter(row)):
+                    self.handle_drifter_death(int(entities.id[row]))
                     self.lives -= 1
                     self.screen_shake = 10
+            entities.sweep()
 
         # Boss collision with player bullets
         if self.boss:
-            for bullet in self.player_bullets[:]:
-                if self.rect_collides_sprite(bullet[0], bullet[1],
-                                            PLAYER_BULLET_W, PLAYER_BULLET_H, self.boss):
-                    if bullet in self.player_bullets:
-                        self.player_bullets.remove(bullet)
-                    self.boss.health -= 1
-                    self.create_explosion(bullet[0], bullet[1], arcade.color.RED)
-                    
-                    if self.boss.health <= 0:
-                        self.create_explosion(self.boss.center_x, self.boss.center_y, arcade.color.GOLD)
-                        self.score += 500 * self.wave * self.score_multiplier
-                        self.boss = None
-                        self.boss_wave = False
-                        self.wave += 1
-                        self.setup_aliens()
-                    break
+            hit_bullets, _ = self.bullet_hits(self.player_bullets, PLAYER_BULLET_W, PLAYER_BULLET_H,
+                                              sprite_bounds([self.boss]))
+            if len(hit_bullets):
+                i = int(hit_bullets[0])
+                bx, by = self.player_bullets.x[i], self.player_bullets.y[i]
+                self.player_bullets.remove(i)
+                self.boss.health -= 1
+                self.create_explosion(bx, by, arcade.color.RED)
+
+                if self.boss.health <= 0:
+                    self.create_explosion(self.boss.center_x, self.boss.center_y, arcade.color.GOLD)
+                    self.score += 500 * self.wave * self.score_multiplier
+                    self.boss = None
+                    self.boss_wave = False
+                    self.wave += 1
+                    self.setup_aliens()
 
     def check_wave_completion(self):
         """Check if wave is cleared"""
         # Check if aliens reached bottom
-        for alien in self.aliens:
-            if alien.bottom <= 50:
-                self.game_over = True
-                self.play_sound('gameover', 0.5)
-                break
+        if self.formation.lowest_bottom() <= 50:
+            self.game_over = True
+            self.play_sound('gameover', 0.5)
 
         # Check if wave is cleared
-        if len(self.aliens) == 0 and not self.boss_wave:
+        if not self.formation.alive.any() and not self.boss_wave:
             self.wave += 1
             self.setup_aliens()
             # Reset alien direction
@@ -932,60 +1004,411 @@ class InvaderSwarm(arcade.Window):
     def cleanup_offscreen(self):
         """Remove off-screen objects"""
         # Remove off-screen player bullets
-        self.player_bullets = [bullet for bullet in self.player_bullets 
-                              if bullet[1] < SCREEN_HEIGHT + 50]
+        self.player_bullets.cull(top=SCREEN_HEIGHT + 50)
         
-        # Remove off-screen alien bullets
-        self.alien_bullets = [bullet for bullet in self.alien_bullets 
-                             if bullet[1] > -50]
+        # Remove off-screen alien bullets; aimed volleys can leave by any side
+        self.alien_bullets.cull(bottom=-50, top=SCREEN_HEIGHT + 50,
+                                left=-50, right=SCREEN_WIDTH + 50)
         
         # Remove off-screen drifters
-        for drifter in self.drifters[:]:
-            if (drifter.center_y < -50 or drifter.center_x < -50 or 
-                drifter.center_x > SCREEN_WIDTH + 50):
-                self.drifters.remove(drifter)
+        entities = self.drifter_entities
+        x = entities.view('x')
+        y = entities.view('y')
+        for row in np.flatnonzero((y < -50) | (x < -50) | (x > SCREEN_WIDTH + 50)).tolist():
+            self.remove_drifter(row)
+        entities.sweep()
+
+    def sweep_sprites(self):
+        """Take the sprites of dead aliens and drifters out of their lists"""
+        self.alien_pool.release_hidden(self.aliens,
+                                       len(self.aliens) - int(self.formation.alive.sum()))
+        self.drifter_pool.release_hidden(self.drifters,
+                                         len(self.drifters) - len(self.drifter_entities))
+
+class InvaderSwarm(arcade.Window):
+    def __init__(self, seed=None, profile=False, record=False, parallax=True,
+                 render_scale=1.0, fullscreen=False):
+        super().__init__(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE,
+                         fullscreen=fullscreen, resizable=True)
+        arcade.set_background_color(arcade.color.BLACK)
+        self.paused = False
+        self.accumulator = 0.0
+        self.scores = ScoreStore()
+        # A replay needs a known seed, so pick one when recording
+        if record and seed is None:
+            seed = random.randrange(2 ** 31)
+        self.seed = seed
+        self.recorder = ReplayRecorder(seed) if record else None
+        self.mixer = None
+        # Render-only, so drawing never touches the engine's random state
+        self.shake_rng = random.Random()
+        # The playfield renders offscreen at render_scale pixels per unit and is
+        # scaled to fit the window; shake shifts the finished frame
+        self.canvas = Canvas(SCREEN_WIDTH, SCREEN_HEIGHT, render_scale, margin=SCREEN_SHAKE)
+        self.background = Background(SCREEN_WIDTH, SCREEN_HEIGHT, margin=SCREEN_SHAKE,
+                                     scale=render_scale)
+        if parallax:
+            self.background.set_parallax(starfield_image(), PARALLAX_SPEED)
+        self.hud = Hud(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.player_bullet_batch = BulletBatch(PLAYER_BULLET_W, PLAYER_BULLET_H,
+                                               arcade.color.WHITE_SMOKE)
+        self.alien_bullet_batch = BulletBatch(ALIEN_BULLET_W, ALIEN_BULLET_H,
+                                              arcade.color.RED)
+
+        # F3 toggles the profiler overlay, F4 dumps a Chrome trace
+        self.profiler = FrameProfiler(enabled=profile)
+        self.profiler_overlay = ProfilerOverlay(self.profiler, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        # Decode every image and sound in the background while the loading
+        # screen is up; the game is built once they are all resident
+        self.startup_time = None
+        self.engine = None
+        self.loader = Preloader(registry, SPRITE_ASSETS + BACKGROUND_ASSETS,
+                                SOUND_FILES.values())
+
+    def finish_loading(self):
+        """Build the game from the preloaded assets"""
+        self.loader.finish()
+        self.load_sounds()
+
+        self.engine = SwarmEngine(self.seed)
+        self.engine.profiler = self.profiler
+        self.engine.sound_handler = self.play_sound
+        self.engine.game_over_handler = self.record_high_score
+        self.load_background()
+
+        self.startup_time = time.perf_counter() - self.loader.start_time
+        print(f"Loaded {self.loader.total} assets in {self.loader.elapsed:.2f}s, "
+              f"startup took {self.startup_time:.2f}s")
+
+    def load_sounds(self):
+        """Hand the decoded MP3 sound files from the asset registry to the mixer"""
+        sounds = {}
+        for name, file_path in SOUND_FILES.items():
+            try:
+                sounds[name] = registry.sound(file_path)
+            except Exception as e:
+                print(f"Could not load {name}: {e}")
+        self.mixer = AudioMixer(sounds, SOUND_LIMITS, MAX_VOICES)
+
+    def play_sound(self, name, volume=0.5):
+        """Queue a sound on the mixer; bursts past its voice limits are dropped"""
+        if self.mixer:
+            self.mixer.play(name, volume)
+
+    def record_high_score(self, score):
+        """Add a finished game to the leaderboard; saved in the background"""
+        engine = self.engine
+        self.scores.submit(score, engine.wave, engine.kills, self.seed)
+
+    def restart(self):
+        if self.recorder:
+            self.recorder.event(RESTART)
+        self.engine.restart()
+        self.load_background()
+
+    def load_background(self):
+        """Pick a random preloaded background"""
+        self.background.select(random.choice(BACKGROUND_ASSETS))
+
+    def draw_loading(self):
+        """Loading screen with a progress bar"""
+        loader = self.loader
+        arcade.draw_text("INVADER SWARM", SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 60,
+                       arcade.color.WHITE, 40, anchor_x="center")
+        bar_width = 400
+        left = SCREEN_WIDTH//2 - bar_width//2
+        bottom = SCREEN_HEIGHT//2 - 10
+        arcade.draw_lrbt_rectangle_filled(
+            left, left + bar_width * loader.progress, bottom, bottom + 20,
+            arcade.color.GREEN
+        )
+        arcade.draw_lrbt_rectangle_outline(
+            left, left + bar_width, bottom, bottom + 20,
+            arcade.color.WHITE, 2
+        )
+        arcade.draw_text(f"Loading {loader.completed}/{loader.total}",
+                       SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50,
+                       arcade.color.WHITE, 16, anchor_x="center")
+
+    def on_draw(self):
+        """Render the game"""
+        engine = self.engine
+        self.canvas.begin()
+        if engine is None:
+            self.draw_loading()
+            self.canvas.present()
+            return
+        prof = self.profiler
+        prof.frame()
+        prof.start('draw')
+
+        # Screen shake; the engine counts it down, the offsets are render-only
+        if engine.screen_shake > 0:
+            shake_x = self.shake_rng.randint(-SCREEN_SHAKE, SCREEN_SHAKE)
+            shake_y = self.shake_rng.randint(-SCREEN_SHAKE, SCREEN_SHAKE)
+        else:
+            shake_x = shake_y = 0
+
+        self.background.draw()
+        prof.lap('background')
+
+        # The simulation runs ahead of the display by a fraction of a tick;
+        # everything moving is drawn that far between its last two states
+        alpha = self.accumulator / TICK_TIME
+
+        # Draw game objects
+        engine.formation.apply(engine.aliens, alpha)
+        moving = (engine.drifters, engine.powerups, engine.player_list, engine.boss_list)
+        saved = [interpolate_sprites(sprite_list, alpha) for sprite_list in moving]
+        engine.aliens.draw()
+        engine.drifters.draw()
+        engine.powerups.draw()
+        engine.player_list.draw()
+
+        if engine.boss_list:
+            engine.boss_list.draw()
+            for boss in engine.boss_list:
+                boss.draw_health_bar()
+        engine.formation.apply(engine.aliens)
+        for sprite_list, positions in zip(moving, saved):
+            restore_sprites(sprite_list, positions)
+        prof.lap('sprites')
+
+        # Draw bullets, one batch per bullet type
+        self.player_bullet_batch.draw(engine.player_bullets, alpha)
+        self.alien_bullet_batch.draw(engine.alien_bullets, alpha)
+        prof.lap('bullets')
+
+        # Draw particles
+        engine.particles.draw(alpha)
+        prof.lap('particles')
+
+        # Draw shield effect
+        if engine.shield_active:
+            player = engine.player
+            prev_x, prev_y = getattr(player, 'prev_position', player.position)
+            arcade.draw_circle_outline(
+                prev_x + alpha * (player.center_x - prev_x),
+                prev_y + alpha * (player.center_y - prev_y),
+                35, arcade.color.BLUE, 2
+            )
+
+        # Draw UI
+        self.draw_ui()
+
+        # Game over screen
+        if engine.game_over:
+            self.draw_game_over()
+        prof.lap('ui')
+
+        self.canvas.present(shake_x, shake_y)
+        prof.lap('present')
+        prof.stop()
+
+        if prof.enabled:
+            self.profiler_overlay.draw()
+
+    def draw_ui(self):
+        """Draw user interface"""
+        self.hud.update(self.engine, self.scores.top_scores())
+        self.hud.draw(self.paused)
+
+    def draw_game_over(self):
+        """Draw game over screen"""
+        # Draw semi-transparent overlay
+        arcade.draw_lrbt_rectangle_filled(
+            0, SCREEN_WIDTH, 0, SCREEN_HEIGHT,
+            (0, 0, 0, 200)
+        )
+        self.hud.draw_game_over(self.engine)
+
+    def on_update(self, delta_time):
+        """Run as many fixed simulation ticks as the elapsed time calls for"""
+        engine = self.engine
+        if engine is None:
+            if self.loader.done:
+                self.finish_loading()
+            return
+        if self.paused or engine.game_over:
+            return
+        self.background.update(delta_time)
+        self.accumulator += min(delta_time, MAX_TICKS_PER_FRAME * TICK_TIME)
+        while self.accumulator >= TICK_TIME:
+            if self.recorder:
+                self.recorder.step(engine)
+            else:
+                engine.step()
+            self.accumulator -= TICK_TIME
+        if self.mixer:
+            self.mixer.flush()
 
     def on_key_press(self, key, modifiers):
         """Handle key presses"""
+        engine = self.engine
+        if engine is None:
+            return
         if key == arcade.key.LEFT or key == arcade.key.A:
-            self.left_pressed = True
+            engine.left_pressed = True
         elif key == arcade.key.RIGHT or key == arcade.key.D:
-            self.right_pressed = True
+            engine.right_pressed = True
         elif key == arcade.key.UP or key == arcade.key.W:
-            self.up_pressed = True
+            engine.up_pressed = True
         elif key == arcade.key.DOWN or key == arcade.key.S:
-            self.down_pressed = True
+            engine.down_pressed = True
         elif key == arcade.key.SPACE:
-            self.fire_pressed = True
+            engine.fire_pressed = True
         elif key == arcade.key.P:
-            if not self.game_over:
+            if not engine.game_over:
                 self.paused = not self.paused
         elif key == arcade.key.R:
-            if self.game_over:
+            if engine.game_over:
                 self.restart()
+        elif key == arcade.key.F3:
+            self.profiler.enabled = not self.profiler.enabled
+            self.profiler.reset()
+        elif key == arcade.key.F4:
+            self.profiler.save_trace('profile_trace.json')
+        elif key == arcade.key.F11:
+            self.set_fullscreen(not self.fullscreen)
         elif key == arcade.key.ESCAPE:
-            if self.game_over:
+            if engine.game_over:
                 arcade.close_window()
             else:
-                self.game_over = True
+                if self.recorder:
+                    self.recorder.event(QUIT)
+                engine.game_over = True
 
     def on_key_release(self, key, modifiers):
         """Handle key releases"""
+        engine = self.engine
+        if engine is None:
+            return
         if key == arcade.key.LEFT or key == arcade.key.A:
-            self.left_pressed = False
+            engine.left_pressed = False
         elif key == arcade.key.RIGHT or key == arcade.key.D:
-            self.right_pressed = False
+            engine.right_pressed = False
         elif key == arcade.key.UP or key == arcade.key.W:
-            self.up_pressed = False
+            engine.up_pressed = False
         elif key == arcade.key.DOWN or key == arcade.key.S:
-            self.down_pressed = False
+            engine.down_pressed = False
         elif key == arcade.key.SPACE:
-            self.fire_pressed = False
+            engine.fire_pressed = False
+
+def sweep_pilot(engine, tick):
+    """Scripted input: hold fire and sweep back and forth across the screen"""
+    sweep_left = (tick // 120) % 2 == 1
+    engine.left_pressed = sweep_left
+    engine.right_pressed = not sweep_left
+    engine.fire_pressed = True
+
+def run_headless(ticks, seed=None, profiler=None, recorder=None):
+    """Step the simulation without a window as fast as it will go
+
+    A scripted pilot sweeps across the screen with the trigger held, and
+    a new game starts whenever one ends. Returns the run statistics.
+    """
+    engine = SwarmEngine(seed)
+    if profiler:
+        engine.profiler = profiler
+    games = 1
+    best_wave = 1
+    start = time.perf_counter()
+    for tick in range(ticks):
+        sweep_pilot(engine, tick)
+        if recorder:
+            recorder.step(engine)
+        else:
+            engine.step()
+        best_wave = max(best_wave, engine.wave)
+        if engine.game_over:
+            if recorder:
+                recorder.event(RESTART)
+            engine.restart()
+            games += 1
+    elapsed = time.perf_counter() - start
+    return {
+        'ticks': ticks,
+        'seconds': elapsed,
+        'ticks_per_second': ticks / elapsed if elapsed > 0 else float('inf'),
+        'games': games,
+        'best_wave': best_wave,
+    }
 
 def main():
     """Main function"""
-    window = InvaderSwarm()
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed for gameplay randomness")
+    parser.add_argument('--headless', action='store_true',
+                        help="run the simulation without a window and report its speed")
+    parser.add_argument('--ticks', type=int, default=10000,
+                        help="number of ticks to simulate in headless mode")
+    parser.add_argument('--profile', action='store_true',
+                        help="time every update and draw stage (F3 toggles in game)")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="write a Chrome trace of the profiled stages on exit")
+    parser.add_argument('--record', metavar='PATH',
+                        help="record the game's inputs to a replay file")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="play a replay back without rendering and verify it")
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help="internal resolution as a multiple of 800x600 (e.g. 0.5 or 2)")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="start full screen (F11 toggles)")
+    parser.add_argument('--no-parallax', action='store_true',
+                        help="draw the backdrop without the scrolling star layer")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    profile = args.profile or bool(args.trace)
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        engine = SwarmEngine(replay.seed)
+        if profile:
+            engine.profiler = FrameProfiler(enabled=True, history=len(replay))
+        stats = play(replay, engine)
+        print(f"{stats['ticks']} ticks in {stats['seconds']:.2f}s "
+              f"({stats['ticks_per_second']:.0f} ticks/s, "
+              f"{stats['ticks_per_second'] / TICK_RATE:.0f}x real time), "
+              f"score {stats['score']}, wave {stats['wave']}")
+        if stats['diverged_at'] is None:
+            print("Replay matches the recording")
+        else:
+            print(f"Replay diverged from the recording by tick {stats['diverged_at']}")
+        if args.trace:
+            engine.profiler.save_trace(args.trace)
+        sys.exit(0 if stats['diverged_at'] is None else 1)
+
+    if args.headless:
+        profiler = FrameProfiler(enabled=True, history=args.ticks) if profile else None
+        seed = args.seed
+        recorder = None
+        if args.record:
+            seed = seed if seed is not None else random.randrange(2 ** 31)
+            recorder = ReplayRecorder(seed)
+        stats = run_headless(args.ticks, seed, profiler, recorder)
+        print(f"{stats['ticks']} ticks in {stats['seconds']:.2f}s "
+              f"({stats['ticks_per_second']:.0f} ticks/s), "
+              f"{stats['games']} games, best wave {stats['best_wave']}")
+        if profiler:
+            for name, stage in profiler.summary().items():
+                print(f"  {name:<28} mean {stage['mean_ms']:.3f}  p99 {stage['p99_ms']:.3f}  "
+                      f"max {stage['max_ms']:.3f} ms")
+            if args.trace:
+                profiler.save_trace(args.trace)
+        if recorder:
+            recorder.save(args.record)
+        return
+
+    window = InvaderSwarm(args.seed, profile=profile, record=bool(args.record),
+                          parallax=not args.no_parallax, render_scale=args.render_scale,
+                          fullscreen=args.fullscreen)
     arcade.run()
+    if args.trace:
+        window.profiler.save_trace(args.trace)
+    if args.record:
+        window.recorder.save(args.record)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -7,13 +7,13 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[
-        ('assets/images/background/*.png', 'assets/images/backgrounds'),
+        ('assets/images/background/*.png', 'assets/images/background'),
         ('assets/images/bosses/*.png', 'assets/images/bosses'),
         ('assets/images/enemies/*.png', 'assets/images/enemies'),
         ('assets/images/player/*.png', 'assets/images/player'),
         ('assets/images/powerups/*.png', 'assets/images/powerups'),
         ('assets/sounds/*.mp3', 'assets/sounds'),
-        ('high_scores.json', '.')
+        ('waves.json', '.')
     ],
     hiddenimports=[],
     hookspath=[],
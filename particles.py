@@ -0,0 +1,136 @@
+import numpy as np
+
+from batches import TriangleBatch
+
+PARTICLE_GRAVITY = 0.2
+PARTICLE_RADIUS = 2
+
+# Two triangles per particle, drawn as a small quad around its center
+_QUAD_CORNERS = np.array([
+    (-1, -1), (1, -1), (1, 1),
+    (-1, -1), (1, 1), (-1, 1)
+], dtype=np.float32) * PARTICLE_RADIUS
+_VERTS_PER_PARTICLE = len(_QUAD_CORNERS)
+_STATE_ARRAYS = ("x", "y", "dx", "dy", "age", "lifetime", "color")
+
+
+class ParticleSystem:
+    """Struct-of-arrays particle pool.
+
+    Live particles are packed into slots [0, count) of preallocated arrays.
+    Dead particles are compacted away in place, so the freed tail slots are
+    reused by the next explosion instead of allocating new objects.
+    """
+    def __init__(self, capacity=2048, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self._allocate(capacity)
+
+        self._batch = TriangleBatch()
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.lifetime = np.ones(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self._vertices = np.zeros((capacity, _VERTS_PER_PARTICLE, 6), dtype=np.float32)
+
+    def _grow(self, needed):
+        """Double capacity until `needed` particles fit, keeping live data"""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        n = self.count
+        old = (self.x, self.y, self.dx, self.dy, self.age, self.lifetime, self.color)
+        self._allocate(capacity)
+        new = (self.x, self.y, self.dx, self.dy, self.age, self.lifetime, self.color)
+        for src, dst in zip(old, new):
+            dst[:n] = src[:n]
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def get_state(self):
+        """Copies of the live particle arrays, by name"""
+        n = self.count
+        return {name: getattr(self, name)[:n].copy() for name in _STATE_ARRAYS}
+
+    def set_state(self, state):
+        n = len(state['x'])
+        if n > self.capacity:
+            self._grow(n)
+        for name in _STATE_ARRAYS:
+            getattr(self, name)[:n] = state[name]
+        self.count = n
+
+    def emit(self, x, y, color, count=20, speed=3, lifetime=30):
+        """Spawn `count` particles at (x, y) with random velocities"""
+        start = self.count
+        end = start + count
+        if end > self.capacity:
+            self._grow(end)
+
+        velocity = self.rng.uniform(-speed, speed, size=(count, 2))
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.dx[start:end] = velocity[:, 0]
+        self.dy[start:end] = velocity[:, 1]
+        self.age[start:end] = 0
+        self.lifetime[start:end] = lifetime
+        self.color[start:end] = color[:3]
+        self.count = end
+
+    def update(self):
+        """Drop expired particles, then integrate the rest in one step"""
+        n = self.count
+        if n == 0:
+            return
+
+        alive = self.age[:n] < self.lifetime[:n]
+        if not alive.all():
+            n = int(alive.sum())
+            for arr in (self.x, self.y, self.dx, self.dy, self.age, self.lifetime, self.color):
+                arr[:n] = arr[:self.count][alive]
+            self.count = n
+
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.dy[:n] -= PARTICLE_GRAVITY
+        self.age[:n] += 1
+
+    def build_vertices(self, alpha=1.0):
+        """Pack live particles into interleaved x, y, r, g, b, a vertex data
+
+        With `alpha` below 1 particles are drawn that far between the
+        previous tick and this one.
+        """
+        n = self.count
+        verts = self._vertices[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        if alpha < 1:
+            # Undo part of the last update: x += dx, y += dy, dy -= gravity
+            lag = 1 - alpha
+            x = x - lag * self.dx[:n]
+            y = y - lag * (self.dy[:n] + PARTICLE_GRAVITY)
+        verts[:, :, 0] = x[:, None] + _QUAD_CORNERS[:, 0]
+        verts[:, :, 1] = y[:, None] + _QUAD_CORNERS[:, 1]
+        verts[:, :, 2:5] = self.color[:n, None, :]
+        verts[:, :, 5] = (255 * (1 - self.age[:n] / self.lifetime[:n]))[:, None]
+        return verts
+
+    def draw(self, alpha=1.0):
+        """Draw every live particle with a single batched draw call"""
+        n = self.count
+        if n == 0:
+            return
+
+        verts = self.build_vertices(alpha)
+        self._batch.draw(verts, self._vertices.nbytes)
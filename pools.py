@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+
+class SpritePool:
+    """Free lists of retired sprites, one per kind.
+
+    Dead sprites are handed back with `release` and come out of `acquire`
+    again instead of being rebuilt, so steady play and wave changes don't
+    allocate sprites or leave garbage behind. `factory(kind)` builds a new
+    sprite only when a kind has none to spare; the caller resets whatever
+    per-use state (position, velocity) the sprite carries. Released sprites
+    are made visible again, since `release_hidden` collects hidden ones.
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self.created = 0
+        self._free = defaultdict(list)
+
+    def acquire(self, kind):
+        free = self._free[kind]
+        if free:
+            return free.pop()
+        sprite = self.factory(kind)
+        sprite.pool_kind = kind
+        self.created += 1
+        return sprite
+
+    def release(self, sprite):
+        sprite.visible = True
+        self._free[sprite.pool_kind].append(sprite)
+
+    def reclaim(self, sprite):
+        """Take a specific released sprite back out of the pool"""
+        self._free[sprite.pool_kind].remove(sprite)
+
+    def release_all(self, sprite_list):
+        """Empty a SpriteList into the pool
+
+        Sprites are popped one at a time rather than cleared, which keeps
+        the list's buffers (and their GPU copies) allocated for reuse.
+        """
+        while sprite_list:
+            self.release(sprite_list.pop())
+
+    def release_hidden(self, sprite_list, count):
+        """Move the `count` hidden sprites of a SpriteList into the pool
+
+        Sprites that die during a tick are only hidden, and this takes them
+        all out at once instead of an O(N) `remove` each. A stable sort moves
+        them to the end without reordering the rest or changing anyone's
+        buffer slot, and popping from the end is O(1).
+        """
+        if count <= 0:
+            return
+        sprite_list.sort(key=lambda sprite: not sprite.visible)
+        for _ in range(count):
+            self.release(sprite_list.pop())
+
+    def free_count(self):
+        return sum(len(free) for free in self._free.values())
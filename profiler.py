@@ -0,0 +1,187 @@
+import json
+import os
+import time
+from collections import deque
+
+import arcade
+import numpy as np
+from pyglet.graphics import Batch
+
+# Histogram buckets in milliseconds, the last one catches everything slower
+HISTOGRAM_BINS = np.array([0, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, np.inf])
+
+
+class FrameProfiler:
+    """Wall-clock timings for the stages of each update and draw pass.
+
+    A pass is bracketed by `start(pass_name)` and `stop()`; `lap(stage)`
+    inside it charges the time since the previous lap to `stage`. The last
+    `history` samples of every stage are kept for rolling statistics and
+    histograms, and the most recent events are kept in Chrome trace-event
+    form for `save_trace`. While disabled every call returns immediately.
+
+    Draw timings are CPU time spent issuing GL calls, not GPU time.
+    """
+    def __init__(self, enabled=False, history=240, trace_limit=200000):
+        self.enabled = enabled
+        self.history = history
+        self.samples = {}
+        self.trace = deque(maxlen=trace_limit)
+        self._origin = time.perf_counter()
+        self._pass = None
+        self._pass_start = 0.0
+        self._last = 0.0
+        self._last_frame = None
+
+    def start(self, pass_name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._pass = pass_name
+        self._pass_start = self._last = now
+
+    def lap(self, stage):
+        if not self.enabled or self._pass is None:
+            return
+        now = time.perf_counter()
+        self._record(f"{self._pass}.{stage}", self._last, now)
+        self._last = now
+
+    def stop(self):
+        if not self.enabled or self._pass is None:
+            return
+        self._record(self._pass, self._pass_start, time.perf_counter())
+        self._pass = None
+
+    def frame(self):
+        """Mark the start of a rendered frame to track frame-to-frame time"""
+        if not self.enabled:
+            self._last_frame = None
+            return
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self._samples("frame").append((now - self._last_frame) * 1000)
+        self._last_frame = now
+
+    def _samples(self, name):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.history)
+        return samples
+
+    def _record(self, name, start, end):
+        self._samples(name).append((end - start) * 1000)
+        self.trace.append((name, self._pass, start, end))
+
+    def reset(self):
+        self.samples.clear()
+        self.trace.clear()
+        self._last_frame = None
+
+    def stats(self, name):
+        """mean/p50/p99/max in ms over the rolling window, or None"""
+        samples = self.samples.get(name)
+        if not samples:
+            return None
+        ms = np.fromiter(samples, dtype=np.float64, count=len(samples))
+        return {
+            'mean_ms': float(ms.mean()),
+            'p50_ms': float(np.percentile(ms, 50)),
+            'p99_ms': float(np.percentile(ms, 99)),
+            'max_ms': float(ms.max()),
+        }
+
+    def histogram(self, name):
+        """Sample counts per HISTOGRAM_BINS bucket over the rolling window"""
+        samples = self.samples.get(name, ())
+        counts, _ = np.histogram(np.fromiter(samples, dtype=np.float64), HISTOGRAM_BINS)
+        return counts
+
+    def summary(self):
+        return {name: self.stats(name) for name in sorted(self.samples)}
+
+    def save_trace(self, path):
+        """Write the recorded events as a Chrome trace (chrome://tracing, Perfetto)"""
+        threads = {}
+        events = []
+        for name, pass_name, start, end in self.trace:
+            tid = threads.setdefault(pass_name, len(threads) + 1)
+            events.append({
+                'name': name.rpartition('.')[2],
+                'cat': pass_name,
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': tid,
+            })
+        for pass_name, tid in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(),
+                           'tid': tid, 'args': {'name': pass_name}})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Wrote {len(events)} trace events to {path}")
+
+
+class ProfilerOverlay:
+    """Frame-time graph and per-stage table drawn over the game"""
+    def __init__(self, profiler, width, height, refresh=15):
+        self.profiler = profiler
+        self.width = width
+        self.height = height
+        self.refresh = refresh
+        self._countdown = 0
+        self.batch = Batch()
+        # One row per stage: name, then right-aligned mean / p99 / max columns
+        self.rows = []
+        for i in range(24):
+            y = height - 130 - i * 14
+            row = [arcade.Text("", 10, y, arcade.color.LIGHT_GREEN, 10, batch=self.batch)]
+            for x in (280, 330, 380):
+                row.append(arcade.Text("", x, y, arcade.color.LIGHT_GREEN, 10,
+                                       anchor_x="right", batch=self.batch))
+            self.rows.append(row)
+
+    def update_text(self):
+        """Rebuild the stage table; only every `refresh` frames to stay cheap"""
+        rows = [("stage", "mean", "p99", "max")]
+        for name, stats in self.profiler.summary().items():
+            if stats is None:
+                continue
+            rows.append((name, f"{stats['mean_ms']:.2f}", f"{stats['p99_ms']:.2f}",
+                         f"{stats['max_ms']:.2f}"))
+        if "frame" in self.profiler.samples:
+            edges = " ".join(f"{edge:g}" for edge in HISTOGRAM_BINS[1:-1])
+            counts = " ".join(str(c) for c in self.profiler.histogram("frame"))
+            rows += [(), (f"frame ms buckets <{edges}<",), (f"  {counts}",)]
+        blank = ("", "", "", "")
+        for labels, row in zip(self.rows, rows + [blank] * len(self.rows)):
+            for label, text in zip(labels, tuple(row) + blank[len(row):]):
+                label.text = text
+
+    def draw(self):
+        if self._countdown <= 0:
+            self.update_text()
+            self._countdown = self.refresh
+        self._countdown -= 1
+
+        # Frame-time graph along the bottom, 1 px per ms
+        graph_left = 10
+        graph_bottom = 10
+        graph_height = 50
+        arcade.draw_lrbt_rectangle_filled(
+            graph_left, graph_left + self.profiler.history * 2,
+            graph_bottom, graph_bottom + graph_height, (0, 0, 0, 160)
+        )
+        for budget, color in ((16.7, arcade.color.GREEN), (33.3, arcade.color.RED)):
+            y = graph_bottom + budget
+            arcade.draw_line(graph_left, y, graph_left + self.profiler.history * 2, y, color, 1)
+
+        frames = self.profiler.samples.get("frame")
+        if frames and len(frames) > 1:
+            ms = np.fromiter(frames, dtype=np.float64, count=len(frames))
+            x = graph_left + np.arange(len(ms)) * 2
+            y = graph_bottom + np.minimum(ms, graph_height)
+            arcade.draw_line_strip(list(zip(x.tolist(), y.tolist())), arcade.color.WHITE, 1)
+
+        self.batch.draw()
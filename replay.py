@@ -0,0 +1,146 @@
+"""Replay recording and playback for SwarmEngine.
+
+A replay is the engine seed plus one input byte per simulated tick, so
+playing it back on a fresh engine reproduces the game exactly. Every
+CHECKPOINT_INTERVAL ticks a checksum of the game state is stored as well;
+playback compares against them to catch the first tick where a change to
+the simulation made the game diverge.
+"""
+import struct
+import time
+import zlib
+
+import numpy as np
+
+MAGIC = b"ISRP"
+VERSION = 1
+# magic, version, seed, tick count, checkpoint count
+HEADER = struct.Struct("<4sBqII")
+CHECKPOINT_INTERVAL = 60
+
+# Input byte: the held keys, plus the one-off events that happened since the
+# previous tick
+INPUT_FLAGS = ("left_pressed", "right_pressed", "up_pressed", "down_pressed", "fire_pressed")
+QUIT = 1 << 5
+RESTART = 1 << 6
+
+
+def input_mask(engine):
+    """Pack the engine's held-key flags into an input byte"""
+    mask = 0
+    for bit, flag in enumerate(INPUT_FLAGS):
+        if getattr(engine, flag):
+            mask |= 1 << bit
+    return mask
+
+
+def apply_input(engine, mask):
+    """Replay one input byte: events first, in the order they can happen"""
+    if mask & QUIT:
+        engine.game_over = True
+    if mask & RESTART:
+        engine.restart()
+    for bit, flag in enumerate(INPUT_FLAGS):
+        setattr(engine, flag, bool(mask & (1 << bit)))
+
+
+def state_checksum(engine):
+    """CRC of the gameplay state that matters for divergence checks"""
+    player = engine.player
+    crc = zlib.crc32(struct.pack(
+        "<qqqq?dd", engine.score, engine.lives, engine.wave, engine.kills,
+        engine.game_over, player.center_x, player.center_y
+    ))
+    formation = engine.formation
+    for array in (formation.offset, formation.alive, np.array([formation.drop])):
+        crc = zlib.crc32(np.ascontiguousarray(array).tobytes(), crc)
+    for pool in (engine.player_bullets, engine.alien_bullets):
+        crc = zlib.crc32(pool.x[:pool.count].tobytes(), crc)
+        crc = zlib.crc32(pool.y[:pool.count].tobytes(), crc)
+    entities = engine.drifter_entities
+    drifters = np.column_stack([entities.view('x'), entities.view('y')])
+    crc = zlib.crc32(drifters.tobytes(), crc)
+    crc = zlib.crc32(struct.pack("<qq", len(engine.powerups), len(engine.particles)), crc)
+    if engine.boss:
+        crc = zlib.crc32(struct.pack("<qd", engine.boss.health, engine.boss.center_x), crc)
+    return crc
+
+
+class Replay:
+    def __init__(self, seed, inputs=b"", checkpoints=()):
+        self.seed = seed
+        self.inputs = bytearray(inputs)
+        self.checkpoints = list(checkpoints)
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, len(self.inputs),
+                                len(self.checkpoints)))
+            f.write(np.array(self.checkpoints, dtype="<u4").tobytes())
+            f.write(zlib.compress(bytes(self.inputs), 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, ticks, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        offset = HEADER.size
+        checkpoints = np.frombuffer(data, dtype="<u4", count=count, offset=offset)
+        inputs = zlib.decompress(data[offset + checkpoints.nbytes:])
+        if len(inputs) != ticks:
+            raise ValueError(f"{path} is truncated: {len(inputs)} of {ticks} ticks")
+        return cls(seed, inputs, checkpoints.tolist())
+
+
+class ReplayRecorder:
+    """Records the ticks an engine runs; use `step` in place of engine.step()"""
+    def __init__(self, seed):
+        self.replay = Replay(seed)
+        self._events = 0
+
+    def event(self, flag):
+        """Note a QUIT or RESTART that happened outside of a tick"""
+        self._events |= flag
+
+    def step(self, engine):
+        replay = self.replay
+        replay.inputs.append(input_mask(engine) | self._events)
+        self._events = 0
+        engine.step()
+        if len(replay.inputs) % CHECKPOINT_INTERVAL == 0:
+            replay.checkpoints.append(state_checksum(engine))
+
+    def save(self, path):
+        self.replay.save(path)
+        print(f"Saved {len(self.replay)} ticks to {path}")
+
+
+def play(replay, engine, verify=True):
+    """Run a replay on a fresh engine built with replay.seed, without rendering
+
+    Returns playback statistics; 'diverged_at' is the first checkpoint tick
+    whose state differs from the recording, or None.
+    """
+    diverged_at = None
+    start = time.perf_counter()
+    for tick, mask in enumerate(replay.inputs, 1):
+        apply_input(engine, mask)
+        engine.step()
+        if verify and diverged_at is None and tick % CHECKPOINT_INTERVAL == 0:
+            expected = replay.checkpoints[tick // CHECKPOINT_INTERVAL - 1]
+            if state_checksum(engine) != expected:
+                diverged_at = tick
+    elapsed = time.perf_counter() - start
+    return {
+        'ticks': len(replay),
+        'seconds': elapsed,
+        'ticks_per_second': len(replay) / elapsed if elapsed > 0 else float('inf'),
+        'diverged_at': diverged_at,
+        'score': engine.score,
+        'wave': engine.wave,
+    }
@@ -0,0 +1,191 @@
+"""Persistent leaderboard kept in a SQLite database in the user's data folder.
+
+Every finished game is one row with its score, wave, kills, seed and the
+time it ended. SQLite commits are atomic, so a crash mid-write leaves the
+previous leaderboard intact. Inserts go through a background writer thread
+and the top of the table is cached in memory, so recording a score never
+blocks the game-over frame.
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+APP_NAME = "InvaderSwarm"
+DB_NAME = "scores.db"
+TOP_N = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    wave INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    seed INTEGER,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+"""
+COLUMNS = ("id", "score", "wave", "kills", "seed", "played_at")
+
+
+def user_data_dir():
+    """The per-user folder for saved data on this platform"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or Path.home() / "AppData" / "Roaming"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / APP_NAME
+
+
+class ScoreStore:
+    """Leaderboard backed by SQLite, written from a background thread.
+
+    `top` holds the best `top_n` games as dicts and is updated as soon as
+    a score is submitted; `history` and `best` query the database for
+    anything beyond that. An unreadable database file is moved aside and a
+    new one started, and if no file can be opened at all the scores are
+    kept in memory for the session.
+    """
+    def __init__(self, path=None, top_n=TOP_N, legacy_path="high_scores.json"):
+        self.path = Path(path) if path else user_data_dir() / DB_NAME
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._db = self._open()
+        self._import_legacy(legacy_path)
+        self.top = self.best(top_n)
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="score-writer",
+                                        daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _open(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            return self._connect(self.path)
+        except sqlite3.DatabaseError as e:
+            broken = self.path.with_suffix(f".corrupt-{int(time.time())}")
+            print(f"High score database unreadable ({e}), moving it to {broken}")
+            try:
+                self.path.replace(broken)
+                # A leftover WAL from the broken file must not be replayed into the new one
+                for suffix in ("-wal", "-shm"):
+                    sidecar = Path(f"{self.path}{suffix}")
+                    if sidecar.exists():
+                        sidecar.replace(f"{broken}{suffix}")
+                return self._connect(self.path)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Could not recreate {self.path}: {e}")
+        except OSError as e:
+            print(f"Could not open {self.path}: {e}")
+        print("High scores will not be saved this session")
+        return self._connect(":memory:")
+
+    @staticmethod
+    def _connect(path):
+        db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        try:
+            # WAL keeps the last committed leaderboard readable through a crash
+            # and lets reads carry on while the writer commits
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+        except Exception:
+            # Leaving it open would keep the file locked on Windows
+            db.close()
+            raise
+        return db
+
+    def _import_legacy(self, legacy_path):
+        """Carry over the bare scores from the old high_scores.json once"""
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM scores LIMIT 1").fetchone():
+                return
+        try:
+            with open(legacy_path) as f:
+                scores = [int(score) for score in json.load(f) if int(score) > 0]
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Skipping old high scores in {legacy_path}: {e}")
+            return
+        mtime = os.path.getmtime(legacy_path)
+        self._insert([(score, 0, 0, None, mtime) for score in scores])
+
+    def _insert(self, rows):
+        with self._lock:
+            with self._db:
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT INTO scores (score, wave, kills, seed, played_at) "
+                    "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _write_loop(self):
+        while True:
+            row = self._queue.get()
+            try:
+                if row is None:
+                    return
+                self._insert([row])
+            except sqlite3.Error as e:
+                print(f"Could not save score {row[0]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, score, wave, kills, seed=None):
+        """Record a finished game; returns its place in the top N, or None"""
+        played_at = time.time()
+        self._queue.put((score, wave, kills, seed, played_at))
+        entry = {'id': None, 'score': score, 'wave': wave, 'kills': kills,
+                 'seed': seed, 'played_at': played_at}
+        # Ties keep the earlier game ahead, as the database index does
+        place = sum(1 for other in self.top if other['score'] >= score)
+        if place >= self.top_n:
+            return None
+        self.top.insert(place, entry)
+        del self.top[self.top_n:]
+        return place
+
+    def top_scores(self):
+        return [entry['score'] for entry in self.top]
+
+    def _query(self, sql, args):
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def best(self, limit=10, offset=0):
+        """Highest scoring games, read from the score index"""
+        return self._query("SELECT * FROM scores ORDER BY score DESC, id LIMIT ? OFFSET ?",
+                           (limit, offset))
+
+    def history(self, limit=50, before_id=None):
+        """Most recent games first; pass the last id seen to page further back"""
+        if before_id is None:
+            return self._query("SELECT * FROM scores ORDER BY id DESC LIMIT ?", (limit,))
+        return self._query("SELECT * FROM scores WHERE id < ? ORDER BY id DESC LIMIT ?",
+                           (before_id, limit))
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def flush(self):
+        """Wait until every submitted score is committed"""
+        self._queue.join()
+
+    def close(self):
+        """Finish pending writes and close the database; runs at exit too"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,96 @@
+import struct
+
+import numpy as np
+
+MAGIC = b"ISSN"
+VERSION = 1
+HEADER = struct.Struct("<4sBH")
+FIELD = struct.Struct("<B2sI")
+_MASK64 = (1 << 64) - 1
+
+
+class Snapshot:
+    """A frozen copy of the simulation state as named flat NumPy arrays.
+
+    `SwarmEngine.snapshot` fills one in and `SwarmEngine.restore` reads it
+    back. On disk each array is stored as its name, a two-character dtype
+    code and the raw little-endian data, so encoding and decoding are a
+    handful of memory copies.
+    """
+    def __init__(self, arrays=None):
+        self.arrays = arrays if arrays is not None else {}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __setitem__(self, name, values):
+        self.arrays[name] = values
+
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def to_bytes(self):
+        parts = [HEADER.pack(MAGIC, VERSION, len(self.arrays))]
+        for name, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            code = array.dtype.newbyteorder('<').str[1:].encode()
+            key = name.encode()
+            parts.append(FIELD.pack(len(key), code, array.size))
+            parts.append(key)
+            parts.append(array.astype(array.dtype.newbyteorder('<'), copy=False).tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} snapshot")
+        offset = HEADER.size
+        arrays = {}
+        for _ in range(count):
+            key_len, code, size = FIELD.unpack_from(data, offset)
+            offset += FIELD.size
+            name = data[offset:offset + key_len].decode()
+            offset += key_len
+            dtype = np.dtype('<' + code.decode())
+            arrays[name] = np.frombuffer(data, dtype=dtype, count=size, offset=offset).copy()
+            offset += dtype.itemsize * size
+        return cls(arrays)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def pack_random_state(rng):
+    """random.Random state as (uint32 words, float64 [has_gauss, gauss])"""
+    version, words, gauss = rng.getstate()
+    return (np.array(words, dtype=np.uint32),
+            np.array([gauss is not None, gauss or 0.0], dtype=np.float64))
+
+
+def unpack_random_state(rng, words, gauss):
+    rng.setstate((3, tuple(words.tolist()), float(gauss[1]) if gauss[0] else None))
+
+
+def pack_generator_state(generator):
+    """PCG64 Generator state as uint64 [state hi, state lo, inc hi, inc lo, has_uint32, uinteger]"""
+    state = generator.bit_generator.state
+    s, inc = state['state']['state'], state['state']['inc']
+    return np.array([s >> 64, s & _MASK64, inc >> 64, inc & _MASK64,
+                     state['has_uint32'], state['uinteger']], dtype=np.uint64)
+
+
+def unpack_generator_state(generator, words):
+    hi, lo, inc_hi, inc_lo, has_uint32, uinteger = (int(w) for w in words)
+    generator.bit_generator.state = {
+        'bit_generator': 'PCG64',
+        'state': {'state': (hi << 64) | lo, 'inc': (inc_hi << 64) | inc_lo},
+        'has_uint32': has_uint32,
+        'uinteger': uinteger,
+    }
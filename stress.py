@@ -0,0 +1,229 @@
+"""Stress test: hold the game at entity counts far beyond a normal wave.
+
+A StressTest keeps an engine topped up with N aliens, M drifters, K alien
+bullets and P particles while the normal update (and, by default, draw)
+paths run, so the point where a subsystem stops scaling shows up in the
+per-stage timings. The alien grid is packed upwards from mid-screen and
+re-laid before it can reach the player; the player is shielded and sweeps
+with the trigger held as in headless runs.
+
+    python stress.py --scale 1 2 4 8
+    python stress.py --aliens 500 --drifters 200 --bullets 1000 --particles 5000
+    python stress.py --aliens 250 --drifters 100 --scale 1 2 4 8 16 --output stress.json
+    python stress.py --aliens 2000 --no-draw
+"""
+import argparse
+import json
+import random
+import time
+
+import arcade
+import numpy as np
+
+from invader_swarm import (SCREEN_WIDTH, SCREEN_HEIGHT, TICK_TIME, WAVES, InvaderSwarm,
+                           SwarmEngine, sweep_pilot)
+from profiler import FrameProfiler
+
+GRID_SPACING = (45, 35)
+GRID_LEFT = 40
+# The lowest row starts here and the rest stack upwards, off screen if need be
+GRID_BOTTOM = 300
+# Re-lay the grid before it descends far enough to end the game
+GRID_FLOOR = 150
+PARTICLE_BURST = 100
+# Level x1 when no counts are given: the full 5x11 grid with the benchmark's
+# drifter swarm, a screenful of bullets and a few explosions' worth of particles
+DEFAULT_COUNTS = {'aliens': 55, 'drifters': 80, 'bullets': 100, 'particles': 1000}
+
+
+def grid_layout(count):
+    """(kinds, x, y) for `count` aliens, rows cycling through the wave row types"""
+    spacing_x, spacing_y = GRID_SPACING
+    cols = int(SCREEN_WIDTH - 2 * GRID_LEFT) // spacing_x + 1
+    index = np.arange(count)
+    row = index // cols
+    row_types = np.array([WAVES.enemy_types.index(name)
+                          for name in WAVES.formation["row_types"]], dtype=np.uint8)
+    kinds = row_types[row % len(row_types)]
+    return (kinds, (GRID_LEFT + (index % cols) * spacing_x).astype(np.float64),
+            (GRID_BOTTOM + row * spacing_y).astype(np.float64))
+
+
+class StressTest:
+    """Keeps an engine populated with the requested entity counts
+
+    Call `refresh(tick)` before every tick. An alien count of 0 leaves the
+    normal waves in place.
+    """
+    def __init__(self, engine, aliens=0, drifters=0, bullets=0, particles=0, seed=0):
+        self.engine = engine
+        self.aliens = aliens
+        self.drifters = drifters
+        self.bullets = bullets
+        self.particles = particles
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+
+    def counts(self):
+        engine = self.engine
+        return {
+            'aliens': len(engine.aliens),
+            'drifters': len(engine.drifters),
+            'bullets': len(engine.player_bullets) + len(engine.alien_bullets),
+            'particles': len(engine.particles),
+        }
+
+    def lay_grid(self):
+        engine = self.engine
+        while engine.boss_list:
+            engine.boss_list.pop()
+        engine.boss = None
+        engine.boss_wave = False
+        engine.wave = 1
+        engine.alien_direction = 1
+        engine.spawn_grid(*grid_layout(self.aliens))
+
+    def refresh(self, tick):
+        engine = self.engine
+        if engine.game_over:
+            engine.restart()
+        engine.effects.activate('shield', 10 ** 9)
+
+        if self.aliens and (engine.boss_wave or len(engine.aliens) < 0.9 * self.aliens
+                            or engine.formation.lowest_bottom() < GRID_FLOOR):
+            self.lay_grid()
+
+        while len(engine.drifters) < self.drifters:
+            engine.spawn_drifter(self.rng.uniform(40, SCREEN_WIDTH - 40),
+                                 self.rng.uniform(SCREEN_HEIGHT - 250, SCREEN_HEIGHT - 60))
+
+        missing = self.bullets - len(engine.alien_bullets)
+        if missing > 0:
+            engine.alien_bullets.spawn_many(
+                self.np_rng.uniform(0, SCREEN_WIDTH, missing),
+                self.np_rng.uniform(SCREEN_HEIGHT / 2, SCREEN_HEIGHT, missing))
+
+        missing = self.particles - len(engine.particles)
+        while missing > 0:
+            count = min(missing, PARTICLE_BURST)
+            engine.particles.emit(self.rng.uniform(0, SCREEN_WIDTH),
+                                  self.rng.uniform(0, SCREEN_HEIGHT),
+                                  arcade.color.ORANGE, count=count, lifetime=60)
+            missing -= count
+
+        sweep_pilot(engine, tick)
+
+
+def _stats(ms):
+    ms = np.asarray(ms, dtype=np.float64)
+    return {
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max()),
+    }
+
+
+def run_stress(counts, ticks=300, warmup=60, window=None, seed=0):
+    """Run one stress level; draws every tick through `window` if given
+
+    Returns the sustained rate, frame and tick timings, the per-stage
+    profile and the entity counts actually held on average.
+    """
+    engine = window.engine if window else SwarmEngine(seed)
+    profiler = FrameProfiler(enabled=True, history=ticks)
+    engine.profiler = profiler
+    if window:
+        window.profiler = window.profiler_overlay.profiler = profiler
+    stress = StressTest(engine, seed=seed, **counts)
+    if stress.aliens:
+        stress.lay_grid()
+
+    frames = []
+    held = []
+    for tick in range(warmup + ticks):
+        if tick == warmup:
+            profiler.reset()
+            start = time.perf_counter()
+        stress.refresh(tick)
+        frame_start = time.perf_counter()
+        if window:
+            window.dispatch_events()
+            window.on_update(TICK_TIME)
+            window.on_draw()
+            window.flip()
+            # Wait for the GPU so draw cost lands in this frame
+            window.ctx.finish()
+        else:
+            engine.step()
+        if tick >= warmup:
+            frames.append((time.perf_counter() - frame_start) * 1000)
+            held.append(tuple(stress.counts().values()))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requested': dict(counts),
+        'held': dict(zip(stress.counts(), np.mean(held, axis=0).round(1).tolist())),
+        'drawn': window is not None,
+        'fps': ticks / elapsed,
+        'frame': _stats(frames),
+        'tick': profiler.stats('update'),
+        'draw': profiler.stats('draw'),
+        'stages': profiler.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invader Swarm stress test")
+    parser.add_argument('--aliens', type=int, default=DEFAULT_COUNTS['aliens'],
+                        help="aliens in the grid (0 keeps the normal waves)")
+    parser.add_argument('--drifters', type=int, default=DEFAULT_COUNTS['drifters'])
+    parser.add_argument('--bullets', type=int, default=DEFAULT_COUNTS['bullets'],
+                        help="alien bullets on screen")
+    parser.add_argument('--particles', type=int, default=DEFAULT_COUNTS['particles'])
+    parser.add_argument('--scale', type=float, nargs='+', default=[1],
+                        help="multiply every count by each factor in turn")
+    parser.add_argument('--ticks', type=int, default=300, help="measured ticks per level")
+    parser.add_argument('--warmup', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-draw', action='store_true',
+                        help="step the engine only, without a window")
+    parser.add_argument('--output', help="JSON file for the results")
+    args = parser.parse_args()
+    if not any(getattr(args, name) > 0 for name in DEFAULT_COUNTS):
+        parser.error("nothing to scale: give at least one positive count")
+
+    window = None
+    if not args.no_draw:
+        window = InvaderSwarm(args.seed, profile=True)
+        window.set_vsync(False)
+        while window.engine is None:
+            window.on_update(0)
+            time.sleep(0.01)
+
+    results = []
+    for factor in args.scale:
+        counts = {name: int(getattr(args, name) * factor) for name in DEFAULT_COUNTS}
+        result = run_stress(counts, args.ticks, args.warmup, window, args.seed)
+        results.append(result)
+
+        held = ", ".join(f"{name} {count:g}" for name, count in result['held'].items())
+        print(f"\nx{factor:g}: {held}")
+        line = (f"  {result['fps']:7.1f} fps  frame {result['frame']['mean_ms']:.2f} ms "
+                f"(p99 {result['frame']['p99_ms']:.2f})  tick {result['tick']['mean_ms']:.2f} ms "
+                f"(p99 {result['tick']['p99_ms']:.2f})")
+        if result['draw']:
+            line += f"  draw {result['draw']['mean_ms']:.2f} ms"
+        print(line)
+        stages = sorted(((stats['mean_ms'], name) for name, stats in result['stages'].items()
+                         if '.' in name), reverse=True)
+        print("  slowest: " + ", ".join(f"{name} {ms:.2f}" for ms, name in stages[:4]))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'seed': args.seed, 'ticks': args.ticks, 'levels': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
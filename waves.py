@@ -0,0 +1,162 @@
+"""Enemy types, wave layouts and bullet volleys, described in waves.json.
+
+The file is compiled once at load time: every volley becomes a pair of
+offset arrays, so firing one is a single `BulletPool.spawn_many`, and each
+wave's layout becomes arrays of enemy kinds and positions that are built
+the first time the wave comes up and reused after that.
+
+Waves follow the "formation" rule (rows and columns grow with the wave
+number) unless "waves" maps the wave number to an explicit layout, given
+as rows of enemy symbols from top to bottom with "." for a gap.
+"""
+import json
+import math
+
+import numpy as np
+
+from assets import resource_path
+
+ENEMY_DEFAULTS = {
+    "speed": 1.0,
+    "volley": "single",
+    "bonus": 0,
+    "powerup_chance": 0.0,
+    "drifters": 0,
+}
+
+
+class Volley:
+    """Bullet spawn offsets from a shooter's muzzle, with optional velocities
+
+    Bullets whose velocity is NaN fall straight down at the pool's speed.
+    """
+    def __init__(self, dx, dy, vx=None, vy=None):
+        self.dx = np.asarray(dx, dtype=np.float64)
+        self.dy = np.asarray(dy, dtype=np.float64)
+        unset = np.full(len(self.dx), np.nan)
+        self.vx = unset if vx is None else np.asarray(vx, dtype=np.float64)
+        self.vy = unset if vy is None else np.asarray(vy, dtype=np.float64)
+        self.falls = np.isnan(self.vx)
+        self.aimed = not self.falls.all()
+
+    def fire(self, pool, x, y):
+        if self.aimed:
+            pool.spawn_many(x + self.dx, y + self.dy,
+                            np.where(self.falls, 0.0, self.vx),
+                            np.where(self.falls, pool.speed, self.vy))
+        else:
+            pool.spawn_many(x + self.dx, y + self.dy)
+
+
+def compile_volley(spec):
+    """Offsets from "offsets" ([dx, dy] pairs) and "arcs" (fans of bullets)
+
+    An arc places a bullet every `step` degrees from `start` to `stop`
+    inclusive, at sin(angle) * rx across and cos(angle) * ry up. With a
+    "speed" each of its bullets flies that many pixels per tick along its
+    angle, measured from straight down; without one they fall straight.
+    """
+    offsets = spec.get("offsets", ())
+    dx = [float(x) for x, _ in offsets]
+    dy = [float(y) for _, y in offsets]
+    vx = [math.nan] * len(dx)
+    vy = [math.nan] * len(dx)
+    for arc in spec.get("arcs", ()):
+        rx, ry = arc["radius"]
+        speed = arc.get("speed")
+        for angle in range(arc["start"], arc["stop"] + 1, arc["step"]):
+            rad = math.radians(angle)
+            dx.append(math.sin(rad) * rx)
+            dy.append(math.cos(rad) * ry)
+            vx.append(math.sin(rad) * speed if speed is not None else math.nan)
+            vy.append(-math.cos(rad) * speed if speed is not None else math.nan)
+    if not dx:
+        raise ValueError(f"volley has no bullets: {spec}")
+    return Volley(dx, dy, vx, vy)
+
+
+def _grow(rule, wave):
+    return min(rule["max"], rule["base"] + wave // rule["every"])
+
+
+class WaveBook:
+    """The compiled contents of a waves file"""
+    def __init__(self, data, screen_height):
+        self.screen_height = screen_height
+        self.volleys = {name: compile_volley(spec) for name, spec in data["volleys"].items()}
+
+        self.enemy_types = list(data["enemies"])
+        self.enemies = {}
+        for name, spec in data["enemies"].items():
+            enemy = dict(ENEMY_DEFAULTS, **spec)
+            if not isinstance(enemy.get("symbol"), str) or len(enemy["symbol"]) != 1:
+                raise ValueError(f"enemy {name} needs a one-character \"symbol\"")
+            if enemy["volley"] not in self.volleys:
+                raise ValueError(f"enemy {name} fires unknown volley {enemy['volley']}")
+            enemy["volley"] = self.volleys[enemy["volley"]]
+            self.enemies[name] = enemy
+        # The same enemies indexed by kind, as stored in the formation
+        self.kinds = [self.enemies[name] for name in self.enemy_types]
+        self.kind_speed = np.array([enemy["speed"] for enemy in self.kinds])
+        self.symbols = {enemy["symbol"]: self.enemy_types.index(name)
+                        for name, enemy in self.enemies.items()}
+
+        self.formation = data["formation"]
+        self.muzzle = tuple(self.formation["muzzle"])
+        self.layouts = {int(wave): rows for wave, rows in data.get("waves", {}).items()}
+
+        boss = data["boss"]
+        self.boss = boss
+        self.boss_muzzle = tuple(boss["muzzle"])
+        self.boss_volleys = [self.volleys[name] for name in boss["volleys"]]
+        self._waves = {}
+
+    def enemy(self, kind):
+        return self.enemies[kind]
+
+    def images(self):
+        return [enemy["image"] for enemy in self.enemies.values()] + [self.boss["image"]]
+
+    def is_boss_wave(self, wave):
+        return wave % self.boss["every"] == 0
+
+    def boss_health(self, wave):
+        health = self.boss["health"]
+        return health["base"] + wave * health["per_wave"]
+
+    def layout(self, wave):
+        """(kinds, x, y) for a wave's grid, row by row from the top
+
+        Kinds index `enemy_types`. Compiled on first use and cached.
+        """
+        table = self._waves.get(wave)
+        if table is None:
+            table = self._waves[wave] = self._compile_layout(wave)
+        return table
+
+    def _compile_layout(self, wave):
+        f = self.formation
+        if wave in self.layouts:
+            grid = [[self.symbols[c] if c != "." else -1 for c in row]
+                    for row in self.layouts[wave]]
+        else:
+            row_types = [self.enemy_types.index(name) for name in f["row_types"]]
+            cols = _grow(f["cols"], wave)
+            grid = [[row_types[row % len(row_types)]] * cols
+                    for row in range(_grow(f["rows"], wave))]
+        kinds, xs, ys = [], [], []
+        spacing_x, spacing_y = f["spacing"]
+        for row, cells in enumerate(grid):
+            for col, kind in enumerate(cells):
+                if kind < 0:
+                    continue
+                kinds.append(kind)
+                xs.append(f["left"] + col * spacing_x)
+                ys.append(self.screen_height - f["top"] - row * spacing_y)
+        return (np.array(kinds, dtype=np.uint8), np.array(xs, dtype=np.float64),
+                np.array(ys, dtype=np.float64))
+
+
+def load_waves(path="waves.json", screen_height=600):
+    with open(resource_path(path)) as f:
+        return WaveBook(json.load(f), screen_height)